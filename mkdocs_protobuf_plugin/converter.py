@@ -1,6 +1,11 @@
 import os
 import re
+import sys
+import shutil
 import logging
+import secrets
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from .import_resolver import ProtoImportResolver
 
@@ -10,12 +15,84 @@ log = logging.getLogger("mkdocs.plugins.protobuf")
 
 FIELD_PATTERN = r"(optional|required|repeated)?\s*(\w+(?:\.\w+)*)\s+(\w+)\s*=\s*(\d+)(?:\s*\[(.*?)\])?;(?:\s*//\s*(.*))?"
 
+# Compiled patterns used while parsing proto files
+FIELD_RE = re.compile(FIELD_PATTERN)
+PACKAGE_RE = re.compile(r"package\s+([^;]+);")
+IMPORT_RE = re.compile(r'import\s+"([^"]+)";')
+DOC_COMMENT_RE = re.compile(r"/\*\*(.*?)\*/", re.DOTALL)
+MESSAGE_RE = re.compile(
+    r"message\s+(\w+)\s*{([^{}]*(?:{[^{}]*(?:{[^{}]*}[^{}]*)*}[^{}]*)*)}", re.DOTALL
+)
+ENUM_RE = re.compile(r"enum\s+(\w+)\s*{([^}]*)}", re.DOTALL)
+ENUM_VALUE_RE = re.compile(r"(\w+)\s*=\s*(\d+)(?:\s*\[(.*?)\])?;(?:\s*//\s*(.*))?")
+SERVICE_RE = re.compile(r"service\s+(\w+)\s*{([^}]*)}", re.DOTALL)
+RPC_LINE_RE = re.compile(
+    r"rpc\s+(\w+)\s*\(\s*(\w+(?:\.\w+)*)\s*\)\s*returns\s*\(\s*(\w+(?:\.\w+)*)\s*\)"
+)
+NESTED_BLOCK_RE = re.compile(r"(message|enum)\s+\w+\s*{[^}]*}")
+FIELD_DOC_COMMENT_RE = re.compile(
+    r"/\*\*(.*?)\*/\s*(?:optional|required|repeated)?\s*\w+(?:\.\w+)*\s+(\w+)\s*=",
+    re.DOTALL,
+)
+FIELD_NAME_RE = re.compile(r"(\w+)\s*=")
+INLINE_COMMENT_RE = re.compile(r";\s*//\s*(.*)$")
+COMMENT_LEAD_RE = re.compile(r"^\s*\*\s*")
+COMMENT_LINE_BREAK_RE = re.compile(r"\n\s*\*\s*")
+COMMENT_PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\*\s*\n")
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Scalar value types, which never link to another message or enum
+PRIMITIVE_TYPES = frozenset(
+    [
+        "double",
+        "float",
+        "int32",
+        "int64",
+        "uint32",
+        "uint64",
+        "sint32",
+        "sint64",
+        "fixed32",
+        "fixed64",
+        "sfixed32",
+        "sfixed64",
+        "bool",
+        "string",
+        "bytes",
+    ]
+)
+
+# Maximum number of distinct proto sources kept in the parse cache
+PARSE_CACHE_SIZE = 512
+
+# Buffer size used when streaming markdown to the output file
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Minimum number of proto files for a parallel conversion to use worker processes
+PARALLEL_MIN_FILES = 16
+
+# Number of proto files handed to a worker process at a time
+PARALLEL_CHUNK_SIZE = 8
+
+# How worker processes are started, forking could deadlock a worker on a lock held
+# by another thread of the parent, such as the livereload threads of mkdocs serve
+PARALLEL_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
 
 class ProtoToMarkdownConverter:
+    # Whether RPC options such as google.api.http annotations are documented
+    supports_annotations = False
+
     def __init__(self):
         # Initialize any parser configuration here
         self.import_resolver = ProtoImportResolver()
         self.output_dir = None
+        # Convert large batches of proto files in worker processes
+        self.parallel = False
+        # Parsed definitions keyed by proto source text
+        self._parse_cache = {}
 
     def convert_proto_files(self, proto_files, output_dir):
         """
@@ -29,21 +106,68 @@ class ProtoToMarkdownConverter:
             self.import_resolver.proto_dirs = self.proto_dirs
         self.import_resolver.initialize(proto_files)
 
-        # Then convert each file to markdown
+        # Then convert each file to markdown, once per distinct file
+        proto_files = list(dict.fromkeys(proto_files))
+        if self.parallel and len(proto_files) >= PARALLEL_MIN_FILES:
+            output_files = self._convert_in_processes(proto_files, output_dir)
+            if output_files is not None:
+                return [output_file for output_file in output_files if output_file]
+
         generated_files = []
         for proto_file in proto_files:
-            try:
-                output_file = self.convert_proto_file(proto_file, output_dir)
-                if output_file:
-                    generated_files.append(output_file)
-            except Exception as e:
-                log.error(f"Error converting proto file {proto_file}: {str(e)}")
-                # Add more detailed error info for debugging
-                import traceback
-
-                log.debug(f"Traceback: {traceback.format_exc()}")
+            output_file = self._convert_proto_file_safe(proto_file, output_dir)
+            if output_file:
+                generated_files.append(output_file)
         return generated_files
 
+    def _convert_proto_file_safe(self, proto_file, output_dir):
+        """
+        Convert a single proto file, logging instead of raising errors
+        Returns the output file path or None
+        """
+        try:
+            return self.convert_proto_file(proto_file, output_dir)
+        except Exception as e:
+            log.error(f"Error converting proto file {proto_file}: {str(e)}")
+            # Add more detailed error info for debugging
+            import traceback
+
+            log.debug(f"Traceback: {traceback.format_exc()}")
+            return None
+
+    def _convert_in_processes(self, proto_files, output_dir):
+        """
+        Convert proto files in a pool of worker processes
+
+        The import resolver initialized by this converter is handed to every
+        worker, so all processes link types the same way.
+
+        Args:
+            proto_files: List of distinct proto files to convert
+            output_dir: The output directory for markdown files
+
+        Returns:
+            List with the output file path or None for each proto file, in the
+            same order, or None if the worker processes could not be used
+        """
+        initargs = (getattr(self, "proto_dirs", []), self.import_resolver, output_dir)
+        try:
+            with ProcessPoolExecutor(
+                mp_context=multiprocessing.get_context(PARALLEL_START_METHOD),
+                initializer=_init_worker,
+                initargs=initargs,
+            ) as executor:
+                return list(
+                    executor.map(
+                        _convert_in_worker, proto_files, chunksize=PARALLEL_CHUNK_SIZE
+                    )
+                )
+        except Exception as e:
+            log.warning(
+                f"Parallel conversion failed, converting in a single process: {str(e)}"
+            )
+            return None
+
     def convert_proto_file(self, proto_file, output_dir):
         """
         Convert a single proto file to markdown
@@ -51,59 +175,38 @@ class ProtoToMarkdownConverter:
         """
         log.info(f"Converting proto file: {proto_file}")
 
+        tmp_file = None
         try:
             # Read the proto file
             with open(proto_file, "r") as f:
                 proto_content = f.read()
 
-            # Parse and convert to markdown
-            proto_path = Path(proto_file)
-            markdown_content = self._proto_to_markdown(
-                proto_content, proto_path.name, proto_file, output_dir
-            )
-
-            # Get absolute paths to work with
-            abs_file_path = os.path.abspath(proto_file)
-
-            # Find the most specific proto directory that contains this file
-            best_proto_dir = None
-            longest_common_path = ""
-
-            if hasattr(self, "proto_dirs"):
-                for dir_path in self.proto_dirs:
-                    try:
-                        abs_dir_path = os.path.abspath(dir_path)
-                        # Check if the proto file is within this directory
-                        common_path = os.path.commonpath([abs_dir_path, abs_file_path])
-                        if common_path == abs_dir_path and len(common_path) > len(
-                            longest_common_path
-                        ):
-                            best_proto_dir = abs_dir_path
-                            longest_common_path = common_path
-                    except ValueError:
-                        # commonpath raises ValueError if paths are on different drives
-                        continue
-
             # Determine output file path, preserving directory structure
-            if best_proto_dir:
-                # Get the relative path from the proto directory to maintain structure
-                rel_path = os.path.relpath(abs_file_path, best_proto_dir)
-                # Create the output file path with the preserved directory structure
-                output_file = os.path.join(
-                    output_dir, os.path.splitext(rel_path)[0] + ".md"
-                )
-            else:
-                # If not in a watched directory, put it in the root of output_dir
-                filename = os.path.basename(proto_file)
-                base_name = os.path.splitext(filename)[0]
-                output_file = os.path.join(output_dir, base_name + ".md")
+            output_file = self.get_output_file(proto_file, output_dir)
 
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            output_file_dir = os.path.dirname(output_file)
+            os.makedirs(output_file_dir, exist_ok=True)
 
-            # Write markdown content
-            with open(output_file, "w") as f:
-                f.write(markdown_content)
+            # Stream the markdown into a temporary file next to the output and
+            # rename it into place, so a failed conversion keeps the markdown of
+            # the previous build
+            proto_path = Path(proto_file)
+            tmp_path = os.path.join(
+                output_file_dir, f".{proto_path.stem}.{secrets.token_hex(8)}.tmp"
+            )
+            # Created like any other file, so the umask applies to its mode
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            tmp_file = tmp_path
+            with os.fdopen(fd, "w", buffering=OUTPUT_BUFFER_SIZE) as f:
+                self._write_markdown(
+                    f, proto_content, proto_path.name, proto_file, output_dir
+                )
+            if os.path.exists(output_file):
+                # Keep the permissions of the previous markdown file
+                shutil.copymode(output_file, tmp_file)
+            os.replace(tmp_file, output_file)
+            tmp_file = None
 
             log.info(f"Generated markdown file: {output_file}")
 
@@ -112,14 +215,35 @@ class ProtoToMarkdownConverter:
         except Exception as e:
             log.error(f"Error converting {proto_file}: {str(e)}")
             return None
+        finally:
+            # Don't leave a partially written markdown file behind
+            if tmp_file and os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def get_output_file(self, proto_file, output_dir):
+        """
+        Get the markdown file path for a proto file
 
-    def _proto_to_markdown(
-        self, proto_content, filename, current_proto_file=None, output_dir=None
+        The directory structure below the most specific proto directory is
+        preserved; files outside all proto directories go to the root of
+        output_dir.
+        """
+        abs_file_path = os.path.abspath(proto_file)
+        best_proto_dir = self._find_best_proto_dir(abs_file_path)
+        if best_proto_dir:
+            rel_path = os.path.relpath(abs_file_path, best_proto_dir)
+        else:
+            rel_path = os.path.basename(proto_file)
+        return os.path.join(output_dir, os.path.splitext(rel_path)[0] + ".md")
+
+    def _write_markdown(
+        self, writer, proto_content, filename, current_proto_file=None, output_dir=None
     ):
         """
-        Convert proto content to markdown format
+        Write the markdown for proto content to a text stream
 
         Args:
+            writer: Text stream the markdown is written to
             proto_content: The content of the proto file
             filename: The filename (for display purposes)
             current_proto_file: The absolute path to the current proto file (for resolving imports)
@@ -128,166 +252,201 @@ class ProtoToMarkdownConverter:
         current_output_file = None
         if current_proto_file and output_dir:
             # Determine the output file path for the current proto file
-            best_proto_dir = self._find_best_proto_dir(current_proto_file)
-            if best_proto_dir:
-                # Get the relative path from the proto directory
-                rel_path = os.path.relpath(current_proto_file, best_proto_dir)
-                current_output_file = os.path.join(
-                    output_dir, os.path.splitext(rel_path)[0] + ".md"
-                )
-            else:
-                # If not in a watched directory, just use the basename
-                basename = os.path.basename(current_proto_file)
-                current_output_file = os.path.join(
-                    output_dir, os.path.splitext(basename)[0] + ".md"
-                )
+            current_output_file = self.get_output_file(current_proto_file, output_dir)
 
-        markdown = f"# Protocol Documentation: {filename}\n\n"
+        writer.write(f"# Protocol Documentation: {filename}\n\n")
+        parsed = self._parse_proto(proto_content)
 
         # Extract package name
-        package_match = re.search(r"package\s+([^;]+);", proto_content)
-        if package_match:
-            package = package_match.group(1)
-            markdown += f"## Package: `{package}`\n\n"
+        package = parsed["package"]
+        if package:
+            writer.write(f"## Package: `{package}`\n\n")
 
         # Extract imports
-        imports = self._extract_imports(proto_content)
+        imports = parsed["imports"]
         if imports:
-            markdown += "## Imports\n\n"
+            writer.write("## Imports\n\n")
             for imp in imports:
-                markdown += f"- `{imp}`\n"
-            markdown += "\n"
+                writer.write(f"- `{imp}`\n")
+            writer.write("\n")
 
         # Extract messages
-        messages = self._extract_messages(proto_content)
+        messages = parsed["messages"]
         if messages:
-            markdown += "## Messages\n\n"
+            writer.write("## Messages\n\n")
             # First process top-level messages (those without a dot in the name)
             for name, content in sorted(messages.items()):
                 if "." not in name:  # Only top-level messages
-                    markdown += self._format_message_markdown(
-                        name, content, messages, current_proto_file, current_output_file
+                    self._write_message(
+                        writer,
+                        name,
+                        content,
+                        messages,
+                        current_proto_file,
+                        current_output_file,
                     )
 
         # Extract enums
-        enums = self._extract_enums(proto_content)
+        enums = parsed["enums"]
         if enums:
-            markdown += "## Enums\n\n"
+            writer.write("## Enums\n\n")
             for name, content in sorted(enums.items()):
-                markdown += f"### {name}\n\n"
+                writer.write(f"### {name}\n\n")
 
                 # Extract enum comment if available
-                comment_match = re.search(r"/\*\*(.*?)\*/", content, re.DOTALL)
+                comment_match = DOC_COMMENT_RE.search(content)
                 if comment_match:
                     comment = comment_match.group(1).strip()
-                    markdown += f"{comment}\n\n"
+                    writer.write(f"{comment}\n\n")
 
                 # Extract enum values
                 values = self._extract_enum_values(content)
                 if values:
-                    markdown += "| Name | Number | Description |\n"
-                    markdown += "|------|--------|-------------|\n"
+                    writer.write("| Name | Number | Description |\n")
+                    writer.write("|------|--------|-------------|\n")
                     for value in values:
-                        markdown += f"| {value['name']} | {value['number']} | {value.get('description', '')} |\n"
-                    markdown += "\n"
+                        writer.write(
+                            f"| {value['name']} | {value['number']} | {value.get('description', '')} |\n"
+                        )
+                    writer.write("\n")
 
         # Extract services
-        services = self._extract_services(proto_content)
+        services = parsed["services"]
         if services:
-            markdown += "## Services\n\n"
+            writer.write("## Services\n\n")
             for name, content in sorted(services.items()):
-                markdown += f"### {name}\n\n"
+                writer.write(f"### {name}\n\n")
 
                 # Extract service comment if available
-                comment_match = re.search(r"/\*\*(.*?)\*/", content, re.DOTALL)
+                comment_match = DOC_COMMENT_RE.search(content)
                 if comment_match:
                     comment = comment_match.group(1).strip()
-                    markdown += f"{comment}\n\n"
-
-                # Extract service methods with a simpler approach
-                methods = []
-
-                # First, preprocess content to find comments
-                service_content_lines = content.splitlines()
-                # commented_lines dictionary was unused - removing
-
-                doc_comment = None
-                for i, line in enumerate(service_content_lines):
-                    # Check for doc comments start
-                    if "/**" in line:
-                        doc_comment = line
-                        j = i + 1
-                        # Collect all comment lines
-                        while (
-                            j < len(service_content_lines)
-                            and "*/" not in service_content_lines[j]
-                        ):
-                            doc_comment += service_content_lines[j]
-                            j += 1
-                        if j < len(service_content_lines):
-                            doc_comment += service_content_lines[j]
-
-                    # Check for rpc method
-                    if "rpc " in line and "(" in line and "returns" in line:
-                        method_line = line
-                        # If the line doesn't end with a semicolon, collect all parts
-                        if ";" not in line:
-                            j = i + 1
-                            while (
-                                j < len(service_content_lines)
-                                and ";" not in service_content_lines[j]
-                            ):
-                                method_line += " " + service_content_lines[j]
-                                j += 1
-                            if j < len(service_content_lines):
-                                method_line += " " + service_content_lines[j]
-
-                        # Now parse the method line
-                        method_match = re.search(
-                            r"rpc\s+(\w+)\s*\(\s*(\w+(?:\.\w+)*)\s*\)\s*returns\s*\(\s*(\w+(?:\.\w+)*)\s*\)",
-                            method_line,
-                        )
-                        if method_match:
-                            method_name = method_match.group(1)
-                            request_type = method_match.group(2)
-                            response_type = method_match.group(3)
-
-                            # Get comment from doc comment or inline comment
-                            description = ""
-                            if doc_comment:
-                                doc_text = re.search(
-                                    r"/\*\*(.*?)\*/", doc_comment, re.DOTALL
-                                )
-                                if doc_text:
-                                    description = (
-                                        doc_text.group(1).strip().replace("\n", " ")
-                                    )
-                                    description = re.sub(r"^\s*\*\s*", "", description)
-                                # Reset doc comment after use
-                                doc_comment = None
-
-                            # Check for inline comment
-                            inline_match = re.search(r";\s*//\s*(.*)$", method_line)
-                            if inline_match and not description:
-                                description = inline_match.group(1).strip()
-
-                            methods.append(
-                                {
-                                    "name": method_name,
-                                    "request": request_type,
-                                    "response": response_type,
-                                    "description": description,
-                                }
-                            )
+                    writer.write(f"{comment}\n\n")
 
+                methods = parsed["service_methods"][name]
                 if methods:
-                    markdown += self._create_method_table(methods, current_output_file, current_proto_file)
+                    self._write_method_table(
+                        writer, methods, current_proto_file, current_output_file
+                    )
+
+    def _parse_proto(self, proto_content):
+        """
+        Parse the top-level definitions of a proto file
+
+        Results are memoized on the source text, so a proto file that is
+        converted again without changes is not parsed a second time. The
+        returned dict is shared between callers and must not be modified.
+        """
+        parsed = self._parse_cache.get(proto_content)
+        if parsed is not None:
+            return parsed
+
+        package_match = PACKAGE_RE.search(proto_content)
+        parsed = {
+            "package": package_match.group(1) if package_match else None,
+            "imports": self._extract_imports(proto_content),
+            "messages": self._extract_messages(proto_content),
+            "enums": self._extract_enums(proto_content),
+            "services": self._extract_services(proto_content),
+        }
+        parsed["service_methods"] = {
+            name: self._scan_service_methods(content)
+            for name, content in parsed["services"].items()
+        }
+
+        # Evict the oldest entry once the cache is full
+        if len(self._parse_cache) >= PARSE_CACHE_SIZE:
+            del self._parse_cache[next(iter(self._parse_cache))]
+        self._parse_cache[proto_content] = parsed
+        return parsed
+
+    def _scan_service_methods(self, content):
+        """
+        Extract the methods of a service block, line by line
+
+        Args:
+            content: The service content
+
+        Returns:
+            List of method dicts with name, request, response and description
+        """
+        methods = []
+
+        # First, preprocess content to find comments
+        service_content_lines = content.splitlines()
+
+        doc_comment = None
+        for i, line in enumerate(service_content_lines):
+            # Check for doc comments start
+            if "/**" in line:
+                doc_comment = line
+                j = i + 1
+                # Collect all comment lines
+                while (
+                    j < len(service_content_lines)
+                    and "*/" not in service_content_lines[j]
+                ):
+                    doc_comment += service_content_lines[j]
+                    j += 1
+                if j < len(service_content_lines):
+                    doc_comment += service_content_lines[j]
+
+            # Check for rpc method
+            if "rpc " in line and "(" in line and "returns" in line:
+                method_line = line
+                # If the line doesn't end with a semicolon, collect all parts
+                if ";" not in line:
+                    j = i + 1
+                    while (
+                        j < len(service_content_lines)
+                        and ";" not in service_content_lines[j]
+                    ):
+                        method_line += " " + service_content_lines[j]
+                        j += 1
+                    if j < len(service_content_lines):
+                        method_line += " " + service_content_lines[j]
+
+                # Now parse the method line
+                method_match = RPC_LINE_RE.search(method_line)
+                if method_match:
+                    method_name = sys.intern(method_match.group(1))
+                    request_type = sys.intern(method_match.group(2))
+                    response_type = sys.intern(method_match.group(3))
+
+                    # Get comment from doc comment or inline comment
+                    description = ""
+                    if doc_comment:
+                        doc_text = DOC_COMMENT_RE.search(doc_comment)
+                        if doc_text:
+                            description = doc_text.group(1).strip().replace("\n", " ")
+                            description = COMMENT_LEAD_RE.sub("", description)
+                        # Reset doc comment after use
+                        doc_comment = None
+
+                    # Check for inline comment
+                    inline_match = INLINE_COMMENT_RE.search(method_line)
+                    if inline_match and not description:
+                        description = inline_match.group(1).strip()
+
+                    methods.append(
+                        {
+                            "name": method_name,
+                            "request": request_type,
+                            "response": response_type,
+                            "description": description,
+                        }
+                    )
 
-        return markdown
+        return methods
 
-    def _create_method_table(self, methods, current_proto_file, current_output_file):
-        markdown = "| Method | Request | Response | Description |\n"
-        markdown += "|--------|---------|----------|-------------|\n"
+    def _write_method_table(
+        self, writer, methods, current_proto_file, current_output_file
+    ):
+        """
+        Write the markdown table for the methods of a service
+        """
+        writer.write("| Method | Request | Response | Description |\n")
+        writer.write("|--------|---------|----------|-------------|\n")
         for method in methods:
             request = method["request"]
             response = method["response"]
@@ -308,100 +467,33 @@ class ProtoToMarkdownConverter:
                 request = f"`{request}`"
                 response = f"`{response}`"
 
-            markdown += f"| {method['name']} | {request} | {response} | {method['description']} |\n"
-        markdown += "\n"
-        return markdown
-
-    def _format_message_markdown(
-        self, name, content, all_messages, current_proto_file=None, output_file=None
+            writer.write(
+                f"| {method['name']} | {request} | {response} | {method['description']} |\n"
+            )
+        writer.write("\n")
+
+    def _write_message(
+        self,
+        writer,
+        name,
+        content,
+        all_messages,
+        current_proto_file=None,
+        output_file=None,
     ):
         """
-        Format a message and its nested messages into markdown
+        Write a message and its nested messages as markdown
 
         Args:
+            writer: Text stream the markdown is written to
             name: The message name
             content: The message content
             all_messages: Dictionary of all messages in the proto file
             current_proto_file: The proto file containing this message, for resolving imports
             output_file: The output markdown file path, for creating proper links
         """
-        markdown = f"### {name}\n\n"
-
-        # Extract message comment if available
-        comment_match = re.search(r"/\*\*(.*?)\*/", content, re.DOTALL)
-        if comment_match:
-            comment = comment_match.group(1).strip()
-            # Clean up multi-line comments by removing * prefixes and normalizing whitespace
-            comment = re.sub(r"\n\s*\*\s*", " ", comment)
-            comment = re.sub(r"\s+", " ", comment).strip()
-            markdown += f"{comment}\n\n"
-
-        # Extract fields
-        fields = self._extract_fields(content, current_proto_file)
-        if fields:
-            markdown += "| Field | Type | Number | Description |\n"
-            markdown += "|-------|------|--------|-------------|\n"
-            for field in fields:
-                # Format description to work with markdown tables - replace newlines with <br>
-                description = field.get("description", "")
-                if description and "\n" in description:
-                    # Replace newlines with HTML break for table compatibility
-                    formatted_desc = description.replace("\n\n", "<br><br>").replace(
-                        "\n", "<br>"
-                    )
-                else:
-                    formatted_desc = description
-
-                # Get field type and try to create a link
-                field_type = field["type"]
-                if (
-                    current_proto_file
-                    and output_file
-                    and self.import_resolver.initialized
-                ):
-                    # Extract the core type (remove modifiers like repeated, optional)
-                    core_type = field_type
-                    if "repeated" in field_type:
-                        core_type = field_type.replace("repeated ", "")
-                    elif "optional" in field_type:
-                        core_type = field_type.replace("optional ", "")
-                    elif "required" in field_type:
-                        core_type = field_type.replace("required ", "")
-
-                    # Check if it's a primitive type or a reference to another message/enum
-                    primitive_types = [
-                        "double",
-                        "float",
-                        "int32",
-                        "int64",
-                        "uint32",
-                        "uint64",
-                        "sint32",
-                        "sint64",
-                        "fixed32",
-                        "fixed64",
-                        "sfixed32",
-                        "sfixed64",
-                        "bool",
-                        "string",
-                        "bytes",
-                    ]
-
-                    if core_type not in primitive_types and "." in core_type:
-                        # Try to create a link to the referenced type
-                        link = self.import_resolver.get_markdown_link(
-                            core_type, output_file, self.output_dir
-                        )
-                        field_type = field_type.replace(
-                            core_type, link.replace("`", "")
-                        )
-                    else:
-                        field_type = f"`{field_type}`"
-                else:
-                    field_type = f"`{field_type}`"
-
-                markdown += f"| {field['name']} | {field_type} | {field['number']} | {formatted_desc} |\n"
-            markdown += "\n"
+        writer.write(f"### {name}\n\n")
+        self._write_message_body(writer, content, current_proto_file, output_file)
 
         # Process nested messages
         nested_prefix = f"{name}."
@@ -411,110 +503,95 @@ class ProtoToMarkdownConverter:
         for nested_name, nested_content in sorted(nested_messages.items()):
             if "." in nested_name:  # This is a nested message
                 nested_simple_name = nested_name.split(".")[-1]
-                markdown += f"#### {nested_simple_name} (nested in {name})\n\n"
+                writer.write(f"#### {nested_simple_name} (nested in {name})\n\n")
+                self._write_message_body(
+                    writer, nested_content, current_proto_file, output_file
+                )
 
-                # Extract nested message comment if available
-                comment_match = re.search(r"/\*\*(.*?)\*/", nested_content, re.DOTALL)
-                if comment_match:
-                    comment = comment_match.group(1).strip()
-                    # Clean up multi-line comments by removing * prefixes and normalizing whitespace
-                    comment = re.sub(r"\n\s*\*\s*", " ", comment)
-                    comment = re.sub(r"\s+", " ", comment).strip()
-                    markdown += f"{comment}\n\n"
-
-                # Extract fields from nested message
-                nested_fields = self._extract_fields(nested_content, current_proto_file)
-                if nested_fields:
-                    markdown += "| Field | Type | Number | Description |\n"
-                    markdown += "|-------|------|--------|-------------|\n"
-                    for field in nested_fields:
-                        # Format description to work with markdown tables - replace newlines with <br>
-                        description = field.get("description", "")
-                        if description and "\n" in description:
-                            # Replace newlines with HTML break for table compatibility
-                            formatted_desc = description.replace(
-                                "\n\n", "<br><br>"
-                            ).replace("\n", "<br>")
-                        else:
-                            formatted_desc = description
-
-                        # Get field type and try to create a link
-                        field_type = field["type"]
-                        if (
-                            current_proto_file
-                            and output_file
-                            and self.import_resolver.initialized
-                        ):
-                            # Extract the core type (remove modifiers like repeated, optional)
-                            core_type = field_type
-                            if "repeated" in field_type:
-                                core_type = field_type.replace("repeated ", "")
-                            elif "optional" in field_type:
-                                core_type = field_type.replace("optional ", "")
-                            elif "required" in field_type:
-                                core_type = field_type.replace("required ", "")
-
-                            # Check if it's a primitive type or a reference to another message/enum
-                            primitive_types = [
-                                "double",
-                                "float",
-                                "int32",
-                                "int64",
-                                "uint32",
-                                "uint64",
-                                "sint32",
-                                "sint64",
-                                "fixed32",
-                                "fixed64",
-                                "sfixed32",
-                                "sfixed64",
-                                "bool",
-                                "string",
-                                "bytes",
-                            ]
-
-                            if core_type not in primitive_types and "." in core_type:
-                                # Try to create a link to the referenced type
-                                link = self.import_resolver.get_markdown_link(
-                                    core_type, output_file, self.output_dir
-                                )
-                                field_type = field_type.replace(
-                                    core_type, link.replace("`", "")
-                                )
-                            else:
-                                field_type = f"`{field_type}`"
-                        else:
-                            field_type = f"`{field_type}`"
+    def _write_message_body(
+        self, writer, content, current_proto_file=None, output_file=None
+    ):
+        """
+        Write the comment and field table of a single message
 
-                        markdown += f"| {field['name']} | {field_type} | {field['number']} | {formatted_desc} |\n"
-                    markdown += "\n"
+        Args:
+            writer: Text stream the markdown is written to
+            content: The message content
+            current_proto_file: The proto file containing this message, for resolving imports
+            output_file: The output markdown file path, for creating proper links
+        """
+        # Extract message comment if available
+        comment_match = DOC_COMMENT_RE.search(content)
+        if comment_match:
+            comment = comment_match.group(1).strip()
+            # Clean up multi-line comments by removing * prefixes and normalizing whitespace
+            comment = COMMENT_LINE_BREAK_RE.sub(" ", comment)
+            comment = WHITESPACE_RE.sub(" ", comment).strip()
+            writer.write(f"{comment}\n\n")
+
+        # Extract fields
+        fields = self._extract_fields(content, current_proto_file)
+        if not fields:
+            return
+
+        writer.write("| Field | Type | Number | Description |\n")
+        writer.write("|-------|------|--------|-------------|\n")
+        for field in fields:
+            # Format description to work with markdown tables - replace newlines with <br>
+            description = field.get("description", "")
+            if description and "\n" in description:
+                # Replace newlines with HTML break for table compatibility
+                formatted_desc = description.replace("\n\n", "<br><br>").replace(
+                    "\n", "<br>"
+                )
+            else:
+                formatted_desc = description
+
+            # Get field type and try to create a link
+            field_type = field["type"]
+            if current_proto_file and output_file and self.import_resolver.initialized:
+                # Extract the core type (remove modifiers like repeated, optional)
+                core_type = field_type
+                if "repeated" in field_type:
+                    core_type = field_type.replace("repeated ", "")
+                elif "optional" in field_type:
+                    core_type = field_type.replace("optional ", "")
+                elif "required" in field_type:
+                    core_type = field_type.replace("required ", "")
+
+                if not field["is_primitive"] and "." in core_type:
+                    # Try to create a link to the referenced type
+                    link = self.import_resolver.get_markdown_link(
+                        core_type, output_file, self.output_dir
+                    )
+                    field_type = field_type.replace(core_type, link.replace("`", ""))
+                else:
+                    field_type = f"`{field_type}`"
+            else:
+                field_type = f"`{field_type}`"
 
-        return markdown
+            writer.write(
+                f"| {field['name']} | {field_type} | {field['number']} | {formatted_desc} |\n"
+            )
+        writer.write("\n")
 
     def _extract_messages(self, content):
         """
         Extract message definitions from proto content
         """
         messages = {}
-        # Pattern to match message definitions at the top level
-        message_pattern = (
-            r"message\s+(\w+)\s*{([^{}]*(?:{[^{}]*(?:{[^{}]*}[^{}]*)*}[^{}]*)*)}"
-        )
 
         # Find all message blocks
-        for match in re.finditer(message_pattern, content, re.DOTALL):
-            name = match.group(1)
+        for match in MESSAGE_RE.finditer(content):
+            name = sys.intern(match.group(1))
             body = match.group(2)
             messages[name] = body
 
             # Find nested messages
-            nested_pattern = (
-                r"message\s+(\w+)\s*{([^{}]*(?:{[^{}]*(?:{[^{}]*}[^{}]*)*}[^{}]*)*)}"
-            )
-            for nested_match in re.finditer(nested_pattern, body, re.DOTALL):
+            for nested_match in MESSAGE_RE.finditer(body):
                 nested_name = nested_match.group(1)
                 nested_body = nested_match.group(2)
-                messages[f"{name}.{nested_name}"] = nested_body
+                messages[sys.intern(f"{name}.{nested_name}")] = nested_body
 
         return messages
 
@@ -529,21 +606,20 @@ class ProtoToMarkdownConverter:
         fields = []
 
         # First, remove any nested message or enum blocks to avoid field extraction within them
-        clean_content = re.sub(r"(message|enum)\s+\w+\s*{[^}]*}", "", message_content)
+        clean_content = NESTED_BLOCK_RE.sub("", message_content)
 
         # Find block comments associated with fields
         block_comments = {}
-        block_pattern = r"/\*\*(.*?)\*/\s*(?:optional|required|repeated)?\s*\w+(?:\.\w+)*\s+(\w+)\s*="
-        for match in re.finditer(block_pattern, clean_content, re.DOTALL):
+        for match in FIELD_DOC_COMMENT_RE.finditer(clean_content):
             comment = match.group(1).strip()
             # Clean up multi-line comments by removing * prefixes and normalizing whitespace
             # but preserve paragraph breaks
-            paragraphs = re.split(r"\n\s*\*\s*\n", comment)
+            paragraphs = COMMENT_PARAGRAPH_BREAK_RE.split(comment)
             formatted_paragraphs = []
             for paragraph in paragraphs:
                 # Replace line breaks with spaces within paragraphs
-                paragraph = re.sub(r"\n\s*\*\s*", " ", paragraph)
-                paragraph = re.sub(r"\s+", " ", paragraph).strip()
+                paragraph = COMMENT_LINE_BREAK_RE.sub(" ", paragraph)
+                paragraph = WHITESPACE_RE.sub(" ", paragraph).strip()
                 formatted_paragraphs.append(paragraph)
 
             # Join paragraphs back with line breaks
@@ -572,7 +648,7 @@ class ProtoToMarkdownConverter:
 
             # Check if next non-comment line is a field definition
             if i < len(lines) and "=" in line and ";" in line:
-                field_match = re.search(r"(\w+)\s*=", line)
+                field_match = FIELD_NAME_RE.search(line)
                 if field_match and comment_lines:
                     field_name = field_match.group(1)
                     if (
@@ -603,10 +679,10 @@ class ProtoToMarkdownConverter:
 
         # Pattern to match field definitions
 
-        for match in re.finditer(FIELD_PATTERN, clean_content):
+        for match in FIELD_RE.finditer(clean_content):
             modifier = match.group(1) or ""
-            field_type = match.group(2)
-            name = match.group(3)
+            field_type = sys.intern(match.group(2))
+            name = sys.intern(match.group(3))
             number = match.group(4)
             options = match.group(5) or ""
             inline_comment = match.group(6) or ""
@@ -618,6 +694,7 @@ class ProtoToMarkdownConverter:
                 or inline_comment
             )
 
+            is_primitive = field_type in PRIMITIVE_TYPES
             if modifier:
                 field_type = f"{modifier} {field_type}"
 
@@ -625,6 +702,7 @@ class ProtoToMarkdownConverter:
                 {
                     "name": name,
                     "type": field_type,
+                    "is_primitive": is_primitive,
                     "number": number,
                     "options": options,
                     "description": comment,
@@ -638,12 +716,10 @@ class ProtoToMarkdownConverter:
         Extract enum definitions from proto content
         """
         enums = {}
-        # Pattern to match enum definitions
-        enum_pattern = r"enum\s+(\w+)\s*{([^}]*)}"
 
         # Find all enum blocks
-        for match in re.finditer(enum_pattern, content, re.DOTALL):
-            name = match.group(1)
+        for match in ENUM_RE.finditer(content):
+            name = sys.intern(match.group(1))
             body = match.group(2)
             enums[name] = body
 
@@ -654,11 +730,9 @@ class ProtoToMarkdownConverter:
         Extract values from an enum block
         """
         values = []
-        # Pattern to match enum value definitions
-        value_pattern = r"(\w+)\s*=\s*(\d+)(?:\s*\[(.*?)\])?;(?:\s*//\s*(.*))?"
 
-        for match in re.finditer(value_pattern, enum_content):
-            name = match.group(1)
+        for match in ENUM_VALUE_RE.finditer(enum_content):
+            name = sys.intern(match.group(1))
             number = match.group(2)
             options = match.group(3) or ""
             comment = match.group(4) or ""
@@ -679,12 +753,10 @@ class ProtoToMarkdownConverter:
         Extract service definitions from proto content
         """
         services = {}
-        # Pattern to match service definitions
-        service_pattern = r"service\s+(\w+)\s*{([^}]*)}"
 
         # Find all service blocks
-        for match in re.finditer(service_pattern, content, re.DOTALL):
-            name = match.group(1)
+        for match in SERVICE_RE.finditer(content):
+            name = sys.intern(match.group(1))
             body = match.group(2)
             services[name] = body
 
@@ -726,13 +798,14 @@ class ProtoToMarkdownConverter:
         Extract import statements from proto content
         """
         imports = []
-        # Pattern to match import statements
-        import_pattern = r'import\s+"([^"]+)";'
 
         # Check for both single line imports and imports with comments
         lines = proto_content.splitlines()
-        for i, line in enumerate(lines):
-            match = re.search(import_pattern, line)
+        for line in lines:
+            # Only run the pattern on lines that can contain an import
+            if "import" not in line:
+                continue
+            match = IMPORT_RE.search(line)
             if match:
                 import_path = match.group(1)
                 imports.append(import_path)
@@ -810,3 +883,23 @@ class ProtoToMarkdownConverter:
             )
 
         return methods
+
+
+# Converter of the current worker process during a parallel conversion
+_worker_converter = None
+
+
+def _init_worker(proto_dirs, import_resolver, output_dir):
+    """Set up the converter of a worker process"""
+    global _worker_converter
+    _worker_converter = ProtoToMarkdownConverter()
+    _worker_converter.proto_dirs = proto_dirs
+    _worker_converter.import_resolver = import_resolver
+    _worker_converter.output_dir = output_dir
+
+
+def _convert_in_worker(proto_file):
+    """Convert a single proto file in a worker process"""
+    return _worker_converter._convert_proto_file_safe(
+        proto_file, _worker_converter.output_dir
+    )
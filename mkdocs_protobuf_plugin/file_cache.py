@@ -1,15 +1,15 @@
 import os
 import json
+import mmap
 import logging
 import hashlib
+import tempfile
 from pathlib import Path
 
 log = logging.getLogger("mkdocs.plugins.protobuf")
 
 __all__ = ["ProtoFileCache"]
 
-__all__ = ["ProtoFileCache"]
-
 
 class ProtoFileCache:
     """
@@ -22,6 +22,8 @@ class ProtoFileCache:
             os.path.expanduser("~"), ".mkdocs_protobuf_cache.json"
         )
         self.file_hashes = {}
+        # Whether file_hashes has updates that are not yet saved to disk
+        self.dirty = False
         self.load_cache()
 
     def load_cache(self):
@@ -36,34 +38,77 @@ class ProtoFileCache:
             self.file_hashes = {}
 
     def save_cache(self):
-        """Save the cache to disk"""
-        try:
-            cache_dir = os.path.dirname(self.cache_file)
-            if cache_dir and not os.path.exists(cache_dir):
-                os.makedirs(cache_dir, exist_ok=True)
+        """Save the cache to disk if it has unsaved updates"""
+        if not self.dirty:
+            return
 
-            with open(self.cache_file, "w") as f:
-                json.dump(self.file_hashes, f)
+        tmp_file = None
+        try:
+            cache_dir = os.path.dirname(os.path.abspath(self.cache_file))
+            os.makedirs(cache_dir, exist_ok=True)
+
+            # Write to a temporary file next to the cache and rename it into
+            # place, so an interrupted write never leaves a truncated cache
+            fd, tmp_file = tempfile.mkstemp(
+                dir=cache_dir, prefix=".mkdocs_protobuf_cache.", suffix=".tmp"
+            )
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.file_hashes, f, separators=(",", ":"))
+            os.replace(tmp_file, self.cache_file)
+            tmp_file = None
+            self.dirty = False
             log.debug(f"Saved cache with {len(self.file_hashes)} entries")
         except Exception as e:
             log.warning(f"Failed to save cache: {str(e)}")
+        finally:
+            if tmp_file and os.path.exists(tmp_file):
+                os.remove(tmp_file)
 
     def get_file_hash(self, file_path):
         """Calculate the hash of a file's contents"""
         try:
+            digest = hashlib.blake2b(digest_size=16)
             with open(file_path, "rb") as f:
-                file_content = f.read()
-                return hashlib.md5(file_content).hexdigest()
+                # Empty files cannot be mapped, their digest is the empty digest
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        digest.update(mm)
+            return digest.hexdigest()
         except Exception as e:
             log.warning(f"Failed to hash file {file_path}: {str(e)}")
             return None
 
-    def is_file_changed(self, file_path):
-        """Check if a file has changed since it was last processed"""
+    def _make_entry(self, stat, file_hash):
+        """Build a cache entry from a file's stat result and content hash"""
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": file_hash}
+
+    def is_file_changed(self, file_path, stat_result=None):
+        """
+        Check if a file has changed since it was last processed
+
+        A stat result of the file that the caller already has, e.g. from
+        os.scandir(), can be passed to avoid calling stat again.
+        """
         abs_path = str(Path(file_path).absolute())
 
         # If file doesn't exist, consider it unchanged
-        if not os.path.exists(abs_path):
+        stat = stat_result
+        if stat is None:
+            try:
+                stat = os.stat(abs_path)
+            except OSError:
+                return False
+
+        # No usable entry means the file was never processed
+        entry = self.file_hashes.get(abs_path)
+        if not isinstance(entry, dict):
+            return True
+
+        # Same size and modification time, skip hashing the contents
+        if (
+            entry.get("size") == stat.st_size
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+        ):
             return False
 
         # Calculate current hash
@@ -73,20 +118,47 @@ class ProtoFileCache:
         if not current_hash:
             return True
 
-        # Compare with previous hash
-        previous_hash = self.file_hashes.get(abs_path)
+        if entry.get("hash") != current_hash:
+            return True
+
+        # Only the metadata changed (e.g. the file was touched), remember the
+        # new stat so the next check can short-circuit again
+        entry["size"] = stat.st_size
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self.dirty = True
+        return False
+
+    def get_output_file(self, file_path):
+        """Get the markdown file last generated for a file, if any"""
+        entry = self.file_hashes.get(str(Path(file_path).absolute()))
+        if isinstance(entry, dict):
+            return entry.get("output")
+        return None
 
-        # If no previous hash or hash changed, the file has changed
-        return previous_hash != current_hash
+    def update_file_hash(self, file_path, output_file=None):
+        """
+        Update the stored hash for a file
 
-    def update_file_hash(self, file_path):
-        """Update the stored hash for a file"""
+        If output_file is given, it is remembered as the markdown file
+        generated for this version of the file.
+
+        The update is kept in memory until save_cache() is called, so a batch
+        of updates costs a single write of the cache file.
+        """
         abs_path = str(Path(file_path).absolute())
+        try:
+            stat = os.stat(abs_path)
+        except OSError as e:
+            log.warning(f"Failed to stat file {file_path}: {str(e)}")
+            return False
+
         current_hash = self.get_file_hash(abs_path)
 
         if current_hash:
-            self.file_hashes[abs_path] = current_hash
-            # Save the cache after each update to ensure persistence
-            self.save_cache()
+            entry = self._make_entry(stat, current_hash)
+            if output_file:
+                entry["output"] = output_file
+            self.file_hashes[abs_path] = entry
+            self.dirty = True
             return True
         return False
@@ -4,69 +4,78 @@ MkDocs Protobuf Plugin - i18n Support
 This module provides compatibility with the mkdocs-static-i18n plugin.
 """
 import logging
+from collections import namedtuple
 
 # Set up logging
 log = logging.getLogger("mkdocs.plugins.protobuf.i18n")
 
 
+# Facts about the i18n plugin configuration, extracted in a single scan
+I18nConfig = namedtuple("I18nConfig", ["active", "languages", "default_language"])
+
+
 class I18nSupport:
     """Support for the mkdocs-static-i18n plugin."""
 
     @staticmethod
-    def is_i18n_active(config):
-        """Check if mkdocs-static-i18n plugin is active in the MkDocs configuration."""
+    def get_i18n_config(config):
+        """Extract the i18n plugin configuration in a single scan of the plugins."""
         plugins = config.get("plugins", {})
-        if isinstance(plugins, list):
-            return any(p == "i18n" or (isinstance(p, dict) and "i18n" in p) for p in plugins)
-        return "i18n" in plugins
 
-    @staticmethod
-    def get_languages(config):
-        """Extract configured languages from mkdocs-static-i18n configuration."""
-        plugins = config.get("plugins", {})
+        active = False
         i18n_config = None
 
         # Extract i18n plugin config based on its structure
         if isinstance(plugins, list):
             for p in plugins:
-                if isinstance(p, dict) and "i18n" in p:
+                if p == "i18n":
+                    active = True
+                elif isinstance(p, dict) and "i18n" in p:
+                    active = True
                     i18n_config = p["i18n"]
                     break
         elif "i18n" in plugins:
+            active = True
             i18n_config = plugins["i18n"]
 
-        if not i18n_config:
-            return []
+        languages = []
+        default_language = None
+        if i18n_config:
+            # Get languages from config
+            config_languages = i18n_config.get("languages", [])
+            if isinstance(config_languages, list):
+                languages = [
+                    lang.get("locale") if isinstance(lang, dict) else lang
+                    for lang in config_languages
+                ]
+            elif isinstance(config_languages, dict):
+                languages = list(config_languages.keys())
+            default_language = i18n_config.get("default_language")
+
+        return I18nConfig(active, languages, default_language)
 
-        # Get languages from config
-        languages = i18n_config.get("languages", [])
-        if isinstance(languages, list):
-            return [lang.get("locale") if isinstance(lang, dict) else lang for lang in languages]
-        return list(languages.keys()) if isinstance(languages, dict) else []
+    @staticmethod
+    def is_i18n_active(config):
+        """Check if mkdocs-static-i18n plugin is active in the MkDocs configuration."""
+        return I18nSupport.get_i18n_config(config).active
+
+    @staticmethod
+    def get_languages(config):
+        """Extract configured languages from mkdocs-static-i18n configuration."""
+        return list(I18nSupport.get_i18n_config(config).languages)
 
     @staticmethod
     def get_default_language(config):
         """Get default language from mkdocs-static-i18n configuration."""
-        plugins = config.get("plugins", {})
-        i18n_config = None
-
-        # Extract i18n plugin config
-        if isinstance(plugins, list):
-            for p in plugins:
-                if isinstance(p, dict) and "i18n" in p:
-                    i18n_config = p["i18n"]
-                    break
-        elif "i18n" in plugins:
-            i18n_config = plugins["i18n"]
-
-        if not i18n_config:
-            return None
-
-        return i18n_config.get("default_language")
+        return I18nSupport.get_i18n_config(config).default_language
 
     @staticmethod
-    def update_i18n_navigation(nav, lang, nav_tree):
-        """Update or create a language-specific API Reference in the navigation."""
+    def update_i18n_navigation(nav, lang, nav_tree, api_keys=("API Reference",)):
+        """Update or create a language-specific API Reference in the navigation.
+
+        Any entry of the language section keyed by one of ``api_keys`` is
+        treated as the existing API Reference and replaced.
+        """
         # Look for a language section in the navigation
         lang_entry = None
         for i, entry in enumerate(nav):
@@ -81,13 +90,16 @@ class I18nSupport:
 
             if isinstance(lang_nav, list):
                 for i, entry in enumerate(lang_nav):
-                    if isinstance(entry, dict) and "API Reference" in entry:
+                    if isinstance(entry, dict) and any(
+                        key in entry for key in api_keys
+                    ):
                         api_entry = i
                         break
 
             if api_entry is not None:
                 # Update existing API Reference
-                lang_nav[api_entry]["API Reference"] = nav_tree
+                api_key = next(key for key in api_keys if key in lang_nav[api_entry])
+                lang_nav[api_entry][api_key] = nav_tree
             else:
                 # Add API Reference to language section
                 if isinstance(lang_nav, list):
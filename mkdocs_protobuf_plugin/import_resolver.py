@@ -1,9 +1,16 @@
 import os
 import re
+import sys
 import logging
 
 log = logging.getLogger("mkdocs.plugins.protobuf")
 
+# Patterns for the package and the top-level definitions of a proto file
+PACKAGE_RE = re.compile(r"package\s+([^;]+);")
+MESSAGE_NAME_RE = re.compile(r"message\s+(\w+)")
+ENUM_NAME_RE = re.compile(r"enum\s+(\w+)")
+SERVICE_NAME_RE = re.compile(r"service\s+(\w+)")
+
 
 class ProtoImportResolver:
     """
@@ -23,6 +30,9 @@ class ProtoImportResolver:
         self.cross_references = (
             {}
         )  # Maps message/service references to their file paths
+        # Maps file paths to ((mtime_ns, size), package, definition names),
+        # kept across initialize() calls so unchanged files are not read again
+        self._definitions_cache = {}
         self.initialized = False
 
     def initialize(self, proto_files):
@@ -74,22 +84,54 @@ class ProtoImportResolver:
             # Add to import map
             self.import_map[import_path] = abs_file_path
 
-            # Read the file to extract package and top-level definitions
-            with open(abs_file_path, "r") as f:
-                content = f.read()
-
-            # Extract package name
-            package_match = re.search(r"package\s+([^;]+);", content)
-            if package_match:
-                package = package_match.group(1)
+            # Get the package and top-level definitions of the file
+            package, definitions = self._get_file_definitions(abs_file_path)
+            if package:
                 self.package_map[package] = abs_file_path
-
-                # Extract message, enum, and service definitions
-                self._extract_definitions(content, package, abs_file_path)
+                for name in definitions:
+                    self.cross_references[sys.intern(f"{package}.{name}")] = (
+                        abs_file_path
+                    )
 
         except Exception as e:
             log.error(f"Error processing proto file {proto_file} for imports: {e}")
 
+    def _get_file_definitions(self, abs_file_path):
+        """
+        Get the package and top-level definition names of a proto file
+
+        Results are memoized per file and reused for as long as the size and
+        modification time of the file are unchanged.
+
+        Args:
+            abs_file_path: Absolute path to a proto file
+
+        Returns:
+            Tuple of the package name (or None) and a list of definition names
+        """
+        stat = os.stat(abs_file_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._definitions_cache.get(abs_file_path)
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+
+        # Read the file to extract package and top-level definitions
+        with open(abs_file_path, "r") as f:
+            content = f.read()
+
+        # Extract package name
+        package = None
+        definitions = []
+        package_match = PACKAGE_RE.search(content)
+        if package_match:
+            package = sys.intern(package_match.group(1))
+
+            # Extract message, enum, and service definitions
+            definitions = self._extract_definitions(content)
+
+        self._definitions_cache[abs_file_path] = (key, package, definitions)
+        return package, definitions
+
     def _find_best_proto_dir(self, file_path):
         """
         Find the most specific proto directory that contains this file
@@ -119,32 +161,31 @@ class ProtoImportResolver:
 
         return best_proto_dir
 
-    def _extract_definitions(self, content, package, file_path):
+    def _extract_definitions(self, content):
         """
         Extract top-level definitions from a proto file
 
         Args:
             content: Content of the proto file
-            package: Package name
-            file_path: Absolute path to the proto file
+
+        Returns:
+            List of message, enum, and service names
         """
+        definitions = []
+
         # Extract message definitions
-        for match in re.finditer(r"message\s+(\w+)", content):
-            message_name = match.group(1)
-            qualified_name = f"{package}.{message_name}"
-            self.cross_references[qualified_name] = file_path
+        for match in MESSAGE_NAME_RE.finditer(content):
+            definitions.append(sys.intern(match.group(1)))
 
         # Extract enum definitions
-        for match in re.finditer(r"enum\s+(\w+)", content):
-            enum_name = match.group(1)
-            qualified_name = f"{package}.{enum_name}"
-            self.cross_references[qualified_name] = file_path
+        for match in ENUM_NAME_RE.finditer(content):
+            definitions.append(sys.intern(match.group(1)))
 
         # Extract service definitions
-        for match in re.finditer(r"service\s+(\w+)", content):
-            service_name = match.group(1)
-            qualified_name = f"{package}.{service_name}"
-            self.cross_references[qualified_name] = file_path
+        for match in SERVICE_NAME_RE.finditer(content):
+            definitions.append(sys.intern(match.group(1)))
+
+        return definitions
 
     def resolve_import(self, import_path, importing_file=None):
         """
@@ -1,8 +1,6 @@
 import os
+import hashlib
 import logging
-from pathlib import Path
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 from mkdocs.plugins import BasePlugin
 from mkdocs.config.config_options import Type
 
@@ -13,144 +11,11 @@ from .i18n_support import I18nSupport
 log = logging.getLogger("mkdocs.plugins.protobuf")
 
 
-class ProtoFileEventHandler(FileSystemEventHandler):
-    def __init__(self, converter, proto_paths, proto_dirs, output_dir, config, plugin):
-        self.converter = converter
-        self.proto_paths = proto_paths
-        self.proto_dirs = proto_dirs
-        self.output_dir = output_dir
-        self.config = config
-        self.plugin = plugin
-
-    def _process_proto_file(self, file_path):
-        """Process a single proto file if it's within our watched paths"""
-        abs_path = str(Path(file_path).absolute())
-
-        # Check if the file is in one of our watched paths
-        in_watched_path = False
-        for proto_path in self.proto_paths:
-            abs_proto_path = os.path.abspath(proto_path)
-            try:
-                if os.path.commonpath([abs_proto_path, abs_path]) == abs_proto_path:
-                    in_watched_path = True
-                    break
-            except ValueError:
-                continue
-
-        if in_watched_path:
-            # Check if this is an output directory file
-            output_path = os.path.abspath(self.output_dir)
-            try:
-                if os.path.commonpath([output_path, abs_path]) == output_path:
-                    log.debug(f"Ignoring file in output directory: {file_path}")
-                    return False
-            except ValueError:
-                pass
-
-            # Check if the file has changed since last processing
-            if not self.plugin.file_cache.is_file_changed(abs_path):
-                log.debug(f"Skipping unchanged proto file: {file_path}")
-                return False
-
-            log.info(f"Processing proto file: {file_path}")
-            generated_files = self.converter.convert_proto_files(
-                [abs_path], self.output_dir
-            )
-
-            # Update the file hash in the cache
-            self.plugin.file_cache.update_file_hash(abs_path)
-
-            # Update the navigation with the new files
-            self.plugin._update_navigation(
-                self.config, self.output_dir, generated_files
-            )
-            return True
-        return False
-
-    def on_modified(self, event):
-        if not event.is_directory and event.src_path.endswith(".proto"):
-            # Skip files in the output directory
-            output_path = os.path.abspath(self.output_dir)
-            abs_event_path = os.path.abspath(event.src_path)
-
-            try:
-                if os.path.commonpath([output_path, abs_event_path]) == output_path:
-                    log.debug(
-                        f"Ignoring modified file in output directory: {event.src_path}"
-                    )
-                    return
-            except ValueError:
-                pass
-
-            # Check if file has actually changed (using the cache)
-            if not self.plugin.file_cache.is_file_changed(abs_event_path):
-                log.debug(f"File content unchanged, skipping: {event.src_path}")
-                return
-
-            self._process_proto_file(event.src_path)
-
-    def on_created(self, event):
-        if not event.is_directory and event.src_path.endswith(".proto"):
-            # Skip files in the output directory
-            output_path = os.path.abspath(self.output_dir)
-            abs_event_path = os.path.abspath(event.src_path)
-
-            try:
-                if os.path.commonpath([output_path, abs_event_path]) == output_path:
-                    log.debug(
-                        f"Ignoring created file in output directory: {event.src_path}"
-                    )
-                    return
-            except ValueError:
-                pass
-
-            self._process_proto_file(event.src_path)
-
-    def on_deleted(self, event):
-        if not event.is_directory and event.src_path.endswith(".proto"):
-            # Find the corresponding markdown file and delete it
-            abs_path = str(Path(event.src_path).absolute())
-            for proto_dir in self.proto_dirs:
-                try:
-                    abs_proto_dir = os.path.abspath(proto_dir)
-                    if os.path.commonpath([abs_proto_dir, abs_path]) == abs_proto_dir:
-                        rel_path = os.path.relpath(abs_path, abs_proto_dir)
-                        md_file = os.path.join(
-                            self.output_dir, os.path.splitext(rel_path)[0] + ".md"
-                        )
-                        if os.path.exists(md_file):
-                            log.info(
-                                f"Deleting markdown file for removed proto: {md_file}"
-                            )
-                            os.remove(md_file)
-                            break
-                except (ValueError, OSError) as e:
-                    log.warning(f"Error handling deleted proto file: {str(e)}")
-
-            # Re-process all proto files to update navigation
-            proto_files = []
-            for proto_path in self.proto_paths:
-                abs_path = os.path.abspath(proto_path)
-                if os.path.isdir(abs_path):
-                    for root, _, files in os.walk(abs_path):
-                        for file in files:
-                            if file.endswith(".proto"):
-                                proto_files.append(os.path.join(root, file))
-                elif os.path.isfile(abs_path) and abs_path.endswith(".proto"):
-                    proto_files.append(abs_path)
-
-            generated_files = self.converter.convert_proto_files(
-                proto_files, self.output_dir
-            )
-            self.plugin._update_navigation(
-                self.config, self.output_dir, generated_files
-            )
-
-
 class ProtobufPlugin(BasePlugin):
     config_scheme = (
         ("proto_paths", Type(list, default=[])),
         ("output_dir", Type(str, default="docs/generated")),
+        ("parallel", Type(bool, default=False)),
     )
 
     def __init__(self):
@@ -159,11 +24,26 @@ class ProtobufPlugin(BasePlugin):
         self.watch_handlers = []
         self.proto_dirs = []
         self.file_cache = ProtoFileCache()
+        # Markdown file generated for each proto file, including the ones
+        # reused from a previous build
+        self.output_files = {}
+        # Fingerprint of the last generated file set written into the nav, and
+        # the nav list it was written into
+        self._last_nav_fingerprint = None
+        self._last_nav = None
+        # i18n configuration of the current build, and the MkDocs config it was
+        # extracted from
+        self._i18n_config = None
+        self._i18n_source = None
 
     def on_config(self, config):
         """
         Process the proto_paths from the config and convert the proto files
         """
+        # The plugins may have changed since the last build
+        self._i18n_config = None
+        self._i18n_source = None
+
         # Get the absolute path to proto files
         proto_paths = self.config.get("proto_paths", [])
         output_dir = self.config.get("output_dir", "docs/generated")
@@ -177,12 +57,13 @@ class ProtobufPlugin(BasePlugin):
 
         # Share proto_dirs with the converter
         self.converter.proto_dirs = self.proto_dirs
+        self.converter.parallel = self.config.get("parallel", False)
 
-        # Convert all proto files at startup
-        generated_files = self._process_proto_files(proto_paths, output_path)
+        # Convert all changed proto files at startup
+        self._process_proto_files(proto_paths, output_path)
 
-        # Update navigation if needed
-        self._update_navigation(config, output_dir, generated_files)
+        # Update navigation if needed, including markdown reused from earlier builds
+        self._update_navigation(config, output_dir, sorted(self.output_files.values()))
 
         # Return the config
         return config
@@ -196,6 +77,11 @@ class ProtobufPlugin(BasePlugin):
             config["docs_dir"], self.config.get("output_dir", "docs/generated")
         )
 
+        # Watching is only needed when serving, so its dependencies are
+        # imported here rather than for every build
+        from watchdog.observers import Observer
+        from .watcher import ProtoFileEventHandler
+
         # Get absolute path to docs directory to filter events
         docs_dir_abs = os.path.abspath(config["docs_dir"])
 
@@ -243,16 +129,6 @@ class ProtobufPlugin(BasePlugin):
         if not generated_files or "nav" not in config:
             return
 
-        # Check if we have manually defined all API files in the nav
-        # If all generated files are already covered by the nav, we don't need to update it
-        if self._are_files_in_nav(config["nav"], generated_files, config["docs_dir"]):
-            log.info("All API files are already in the navigation, not updating nav")
-            return
-
-        # Check if i18n plugin is active
-        is_i18n_active = I18nSupport.is_i18n_active(config)
-        languages = I18nSupport.get_languages(config) if is_i18n_active else []
-
         # Convert paths to be relative to docs_dir
         docs_dir = config["docs_dir"]
         rel_files = []
@@ -269,19 +145,30 @@ class ProtobufPlugin(BasePlugin):
             else:
                 rel_files.append(file_path)
 
+        # Skip rebuilding the nav tree if this nav already lists the same file set
+        fingerprint = self._nav_fingerprint(output_dir, rel_files)
+        if (
+            fingerprint == self._last_nav_fingerprint
+            and config["nav"] is self._last_nav
+        ):
+            log.debug("Generated file set unchanged, not rebuilding navigation")
+            return
+
+        # Check if we have manually defined all API files in the nav
+        # If all generated files are already covered by the nav, we don't need to update it
+        if self._are_files_in_nav(config["nav"], generated_files, config["docs_dir"]):
+            log.info("All API files are already in the navigation, not updating nav")
+            return
+
+        # Check if i18n plugin is active
+        i18n_config = self._get_i18n_config(config)
+        is_i18n_active = i18n_config.active
+        languages = i18n_config.languages if is_i18n_active else []
+
         # Handle navigation based on whether i18n is active
         if is_i18n_active and languages:
             # For i18n, we need to organize files by language
-            lang_file_groups = {}
-            for lang in languages:
-                lang_prefix = f"{lang}/"
-                # Files for this language (starting with lang prefix)
-                lang_files = [f for f in rel_files if f.startswith(lang_prefix)]
-
-                if lang_files:
-                    # Strip language prefix for nav tree building
-                    stripped_files = [f[len(lang_prefix):] for f in lang_files]
-                    lang_file_groups[lang] = stripped_files
+            lang_file_groups = I18nSupport.build_i18n_nav_tree(rel_files, languages)
 
             # Process each language separately
             for lang, lang_files in lang_file_groups.items():
@@ -319,47 +206,36 @@ class ProtobufPlugin(BasePlugin):
                     # Add API Reference entry
                     config["nav"].append({"API Reference": api_nav})
 
-            log.info(f"Updated navigation with {len(rel_files)} API documentation files")
+            log.info(
+                f"Updated navigation with {len(rel_files)} API documentation files"
+            )
 
-    def _update_lang_nav(self, nav, lang, nav_tree, output_dir):
+        self._last_nav_fingerprint = fingerprint
+        self._last_nav = config["nav"]
+
+    def _get_i18n_config(self, config):
         """
-        Update language-specific navigation with API documentation
+        Get the i18n configuration of the MkDocs config, extracted once per build
         """
-        # Look for language section in the navigation
-        lang_entry = None
-        for i, entry in enumerate(nav):
-            if isinstance(entry, dict) and lang in entry:
-                lang_entry = i
-                break
-
-        if lang_entry is not None:
-            # Language section exists
-            lang_nav = nav[lang_entry][lang]
-
-            # Look for API Reference in this language section
-            api_entry = None
-            api_keys = ["API Reference", "API", output_dir]
-
-            if isinstance(lang_nav, list):
-                for i, entry in enumerate(lang_nav):
-                    if isinstance(entry, dict) and any(key in entry for key in api_keys):
-                        api_entry = i
-                        break
+        if self._i18n_source is not config:
+            self._i18n_config = I18nSupport.get_i18n_config(config)
+            self._i18n_source = config
+        return self._i18n_config
 
-            if api_entry is not None:
-                # Update existing API Reference in this language
-                api_key = next(key for key in api_keys if key in lang_nav[api_entry])
-                lang_nav[api_entry][api_key] = nav_tree
-            else:
-                # Add API Reference to this language section
-                if isinstance(lang_nav, list):
-                    lang_nav.append({"API Reference": nav_tree})
-                else:
-                    nav[lang_entry][lang] = [{"API Reference": nav_tree}]
-        else:
-            # Language section doesn't exist, create it with API Reference
-            nav.append({lang: [{"API Reference": nav_tree}]})
+    def _nav_fingerprint(self, output_dir, rel_files):
+        """
+        Compute a fingerprint of the set of files that make up the API navigation
+        """
+        parts = [output_dir] + sorted(rel_files)
+        return hashlib.blake2b("\x00".join(parts).encode("utf-8")).hexdigest()
 
+    def _update_lang_nav(self, nav, lang, nav_tree, output_dir):
+        """
+        Update language-specific navigation with API documentation
+        """
+        I18nSupport.update_i18n_navigation(
+            nav, lang, nav_tree, ["API Reference", "API", output_dir]
+        )
         log.info(f"Updated navigation for language '{lang}' with API documentation")
 
     def _are_files_in_nav(self, nav, generated_files, docs_dir):
@@ -379,16 +255,15 @@ class ProtobufPlugin(BasePlugin):
                 rel_generated_files.append(file_path)
 
         # Recursively search for all file paths in the nav
-        nav_files = []
+        nav_files = set()
         self._extract_nav_files(nav, nav_files)
 
         # Check if all generated files are in the nav
-        missing_files = [f for f in rel_generated_files if f not in nav_files]
-        return len(missing_files) == 0
+        return nav_files.issuperset(rel_generated_files)
 
     def _extract_nav_files(self, nav_item, result):
         """
-        Recursively extract all file paths from a nav item
+        Recursively extract all file paths from a nav item into a set
         """
         if isinstance(nav_item, list):
             for item in nav_item:
@@ -396,11 +271,11 @@ class ProtobufPlugin(BasePlugin):
         elif isinstance(nav_item, dict):
             for key, value in nav_item.items():
                 if isinstance(value, str):
-                    result.append(value)
+                    result.add(value)
                 else:
                     self._extract_nav_files(value, result)
         elif isinstance(nav_item, str):
-            result.append(nav_item)
+            result.add(nav_item)
 
     def _build_nav_tree(self, file_paths):
         """
@@ -413,16 +288,11 @@ class ProtobufPlugin(BasePlugin):
             components = file_path.replace("\\", "/").split("/")
             current = nav_tree
 
-            # Process each path component except the last one (filename)
-            for i, component in enumerate(components[:-1]):
+            # Descend into the directory components, creating them as needed
+            for component in components[:-1]:
                 # Skip empty components
-                if not component:
-                    continue
-
-                if component not in current:
-                    current[component] = {}
-
-                current = current[component]
+                if component:
+                    current = current.setdefault(component, {})
 
             # Add the file to the current level
             filename = components[-1]
@@ -458,6 +328,10 @@ class ProtobufPlugin(BasePlugin):
             self.observer.stop()
             self.observer.join()
 
+        # Drop events that are still waiting for their debounce timer
+        for handler in self.watch_handlers:
+            handler.cancel()
+
         # Save the file cache
         self.file_cache.save_cache()
 
@@ -466,7 +340,7 @@ class ProtobufPlugin(BasePlugin):
         Process all proto files from the given paths
         Returns a list of generated markdown files
         """
-        proto_files = set()  # Use a set to avoid duplicates
+        proto_files = {}  # Maps proto file paths to their stat results, if known
         generated_files = []
 
         # Get absolute path to output directory to filter paths
@@ -497,22 +371,8 @@ class ProtobufPlugin(BasePlugin):
                         )
                         continue
 
-                    for root, _, files in os.walk(abs_path):
-                        for file in files:
-                            if file.endswith(".proto"):
-                                file_path = os.path.join(root, file)
-                                # Skip files in the output directory
-                                try:
-                                    if (
-                                        os.path.commonpath(
-                                            [output_dir_abs, os.path.abspath(file_path)]
-                                        )
-                                        == output_dir_abs
-                                    ):
-                                        continue
-                                except ValueError:
-                                    pass
-                                proto_files.add(file_path)
+                    for file_path, stat in self._iter_proto_files(abs_path):
+                        proto_files[file_path] = stat
             except ValueError as e:
                 log.warning(f"Error processing proto path {abs_path}: {str(e)}")
             except Exception as e:
@@ -531,24 +391,27 @@ class ProtobufPlugin(BasePlugin):
                 pass
 
             if os.path.exists(abs_path) and abs_path not in proto_files:
-                proto_files.add(abs_path)
+                proto_files[abs_path] = None
             elif not os.path.exists(abs_path):
                 log.warning(f"Proto file not found: {abs_path}")
 
+        self.output_files = {}
         if proto_files:
-            # Filter files that have changed
+            # Filter files that have changed or whose markdown is missing
             changed_files = []
-            for file_path in proto_files:
+            for file_path in sorted(proto_files):
                 abs_path = os.path.abspath(file_path)
-                if self.file_cache.is_file_changed(abs_path):
+                if self._needs_conversion(abs_path, output_dir, proto_files[file_path]):
                     changed_files.append(file_path)
-                    # Update the cache with the new file hash
-                    self.file_cache.update_file_hash(abs_path)
+                else:
+                    self.output_files[abs_path] = self.file_cache.get_output_file(
+                        abs_path
+                    )
 
             if changed_files:
                 # Only process files that have changed
                 try:
-                    generated_files = self.converter.convert_proto_files(
+                    generated_files = self._convert_changed_files(
                         changed_files, output_dir
                     )
                     log.info(
@@ -563,4 +426,67 @@ class ProtobufPlugin(BasePlugin):
         else:
             log.warning("No proto files found in the specified paths")
 
+        # Persist all hash updates from this batch at once
+        self.file_cache.save_cache()
+
+        return generated_files
+
+    def _iter_proto_files(self, root):
+        """
+        Yield the path and stat result of every proto file below a directory
+
+        The stat results come from the directory scan, so the file cache can
+        use them without calling stat again. Symbolic links to directories
+        are not followed, like os.walk().
+        """
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(".proto"):
+                            try:
+                                yield entry.path, entry.stat()
+                            except OSError as e:
+                                log.warning(
+                                    f"Could not stat proto file {entry.path}: {str(e)}"
+                                )
+            except OSError as e:
+                log.warning(f"Could not scan proto directory {current}: {str(e)}")
+
+    def _needs_conversion(self, abs_path, output_dir, stat_result=None):
+        """
+        Check if a proto file has to be converted again
+
+        This is the case if the file changed since it was last processed, or if
+        the markdown generated for it is not where this build expects it.
+        """
+        if self.file_cache.is_file_changed(abs_path, stat_result):
+            return True
+
+        output_file = self.file_cache.get_output_file(abs_path)
+        return output_file != self.converter.get_output_file(
+            abs_path, output_dir
+        ) or not os.path.exists(output_file)
+
+    def _convert_changed_files(self, changed_files, output_dir):
+        """
+        Convert the given proto files and remember their hashes and outputs
+
+        Files that fail to convert are not recorded, so they are retried on the
+        next build. Returns the list of generated markdown files.
+        """
+        generated_files = self.converter.convert_proto_files(changed_files, output_dir)
+        generated = set(generated_files)
+
+        for file_path in changed_files:
+            abs_path = os.path.abspath(file_path)
+            output_file = self.converter.get_output_file(file_path, output_dir)
+            if output_file in generated:
+                self.file_cache.update_file_hash(abs_path, output_file)
+                self.output_files[abs_path] = output_file
+
         return generated_files
@@ -0,0 +1,176 @@
+import os
+import logging
+import threading
+from watchdog.events import FileSystemEventHandler
+
+log = logging.getLogger("mkdocs.plugins.protobuf")
+
+# Seconds without new file system events before queued proto files are processed
+DEBOUNCE_DELAY = 0.3
+
+
+class ProtoFileEventHandler(FileSystemEventHandler):
+    def __init__(
+        self,
+        converter,
+        proto_paths,
+        proto_dirs,
+        output_dir,
+        config,
+        plugin,
+        debounce_delay=DEBOUNCE_DELAY,
+    ):
+        self.converter = converter
+        self.proto_paths = proto_paths
+        self.proto_dirs = proto_dirs
+        self.output_dir = output_dir
+        self.config = config
+        self.plugin = plugin
+        self.debounce_delay = debounce_delay
+
+        # Precompute path prefixes so each event only needs startswith checks
+        self._output_prefix = os.path.join(os.path.abspath(output_dir), "")
+        abs_proto_paths = [os.path.abspath(path) for path in proto_paths]
+        self._watched_paths = frozenset(abs_proto_paths)
+        self._watched_prefixes = tuple(
+            os.path.join(path, "") for path in abs_proto_paths
+        )
+
+        # Events are collected here until the debounce timer fires
+        self._lock = threading.Lock()
+        self._process_lock = threading.Lock()
+        self._pending_files = set()
+        self._rescan_pending = False
+        self._timer = None
+
+    def _should_ignore(self, abs_path):
+        """Check if a path is outside the watched paths or in the output directory"""
+        if abs_path.startswith(self._output_prefix):
+            return True
+        return not (
+            abs_path in self._watched_paths
+            or abs_path.startswith(self._watched_prefixes)
+        )
+
+    def _schedule(self, abs_path=None, rescan=False):
+        """
+        Queue a proto file event and restart the debounce timer
+
+        Bursts of events (editor saves, git checkouts) are coalesced into a
+        single regeneration once no new event arrived for debounce_delay seconds.
+        """
+        with self._lock:
+            if abs_path:
+                self._pending_files.add(abs_path)
+            if rescan:
+                self._rescan_pending = True
+
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Process all proto file events queued since the last flush"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending_files = sorted(self._pending_files)
+            rescan = self._rescan_pending
+            self._pending_files = set()
+            self._rescan_pending = False
+
+        with self._process_lock:
+            if rescan:
+                self._process_all_proto_files()
+            elif pending_files:
+                self._process_proto_files(pending_files)
+
+    def cancel(self):
+        """Drop any queued events without processing them"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending_files = set()
+            self._rescan_pending = False
+
+    def _process_proto_files(self, abs_paths):
+        """Process the given proto files if they changed since the last processing"""
+        changed_files = []
+        for abs_path in abs_paths:
+            # Check if the file has changed since last processing
+            if self.plugin.file_cache.is_file_changed(abs_path):
+                changed_files.append(abs_path)
+            else:
+                log.debug(f"Skipping unchanged proto file: {abs_path}")
+
+        if not changed_files:
+            return False
+
+        log.info(f"Processing {len(changed_files)} changed proto files")
+        self.plugin._convert_changed_files(changed_files, self.output_dir)
+        self.plugin.file_cache.save_cache()
+
+        # Update the navigation with all known output files
+        self.plugin._update_navigation(
+            self.config, self.output_dir, sorted(self.plugin.output_files.values())
+        )
+        return True
+
+    def _process_all_proto_files(self):
+        """Re-process all proto files, e.g. after a proto file was removed"""
+        self.plugin._process_proto_files(self.proto_paths, self.output_dir)
+        self.plugin._update_navigation(
+            self.config, self.output_dir, sorted(self.plugin.output_files.values())
+        )
+
+    def _on_proto_event(self, event):
+        """Queue a created or modified proto file for processing"""
+        if not event.is_directory and event.src_path.endswith(".proto"):
+            abs_path = os.path.abspath(event.src_path)
+            if self._should_ignore(abs_path):
+                log.debug(
+                    "Ignoring file outside watched paths or in output directory: "
+                    f"{event.src_path}"
+                )
+                return
+            self._schedule(abs_path)
+
+    def on_modified(self, event):
+        self._on_proto_event(event)
+
+    def on_created(self, event):
+        self._on_proto_event(event)
+
+    def on_deleted(self, event):
+        if not event.is_directory and event.src_path.endswith(".proto"):
+            abs_path = os.path.abspath(event.src_path)
+            if self._should_ignore(abs_path):
+                log.debug(
+                    f"Ignoring deleted file outside watched paths: {event.src_path}"
+                )
+                return
+
+            # Find the corresponding markdown file and delete it
+            for proto_dir in self.proto_dirs:
+                try:
+                    abs_proto_dir = os.path.abspath(proto_dir)
+                    if os.path.commonpath([abs_proto_dir, abs_path]) == abs_proto_dir:
+                        rel_path = os.path.relpath(abs_path, abs_proto_dir)
+                        md_file = os.path.join(
+                            self.output_dir, os.path.splitext(rel_path)[0] + ".md"
+                        )
+                        if os.path.exists(md_file):
+                            log.info(
+                                f"Deleting markdown file for removed proto: {md_file}"
+                            )
+                            os.remove(md_file)
+                            break
+                except (ValueError, OSError) as e:
+                    log.warning(f"Error handling deleted proto file: {str(e)}")
+
+            # Re-process all proto files to update navigation
+            self._schedule(rescan=True)
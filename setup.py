@@ -12,6 +12,12 @@ setup(
         "mkdocs>=1.4.0",
         "watchdog>=2.1.0",
     ],
+    extras_require={
+        "test": [
+            "pytest>=7.0.0",
+            "pytest-xdist>=3.0.0",
+        ],
+    },
     entry_points={
         "mkdocs.plugins": [
             "protobuf = mkdocs_protobuf_plugin:ProtobufPlugin",
@@ -2,3 +2,40 @@
 """
 This file marks the test directory as a Python package.
 """
+
+import atexit
+import copy
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# Directory used for test fixtures when it is available, it is backed by RAM on Linux
+FAST_TMPDIR = "/dev/shm"
+
+
+def fast_tmpdir():
+    """Return a RAM-backed directory for temporary files, or None to use the default"""
+    if os.environ.get("TMPDIR"):
+        # An explicitly configured temporary directory wins
+        return None
+    if os.path.isdir(FAST_TMPDIR) and os.access(FAST_TMPDIR, os.W_OK | os.X_OK):
+        return FAST_TMPDIR
+    return None
+
+
+# Temporary directories are removed in the background so the next test does not wait
+# for it, the removals still in flight are finished when the interpreter exits
+_cleanup_pool = ThreadPoolExecutor(max_workers=2)
+atexit.register(_cleanup_pool.shutdown, wait=True)
+
+
+def remove_tmpdir(path):
+    """Remove a temporary test directory in a background thread"""
+    _cleanup_pool.submit(shutil.rmtree, path, ignore_errors=True)
+
+
+def fork_config(config):
+    """Copy a MkDocs config dict, deep-copying only the nav that tests mutate"""
+    forked = dict(config)
+    forked["nav"] = copy.deepcopy(config.get("nav", []))
+    return forked
@@ -1,27 +1,14 @@
 import unittest
 import tempfile
 import os
-import shutil
+import stat
+from pathlib import Path
+from unittest import mock
 
-from mkdocs_protobuf_plugin.converter import ProtoToMarkdownConverter
+from mkdocs_protobuf_plugin.converter import ProtoToMarkdownConverter, PARALLEL_MIN_FILES
+from test import fast_tmpdir, remove_tmpdir
 
-
-class TestProtoApiGeneration(unittest.TestCase):
-    """Tests specifically focused on API documentation generation."""
-
-    def setUp(self):
-        # Create temporary directories
-        self.temp_dir = tempfile.mkdtemp()
-        self.proto_dir = os.path.join(self.temp_dir, "proto")
-        os.makedirs(self.proto_dir)
-        self.output_dir = os.path.join(self.temp_dir, "output")
-        os.makedirs(self.output_dir)
-
-        # Create a service proto file with different API types
-        self.service_proto_path = os.path.join(self.proto_dir, "service.proto")
-        with open(self.service_proto_path, "w") as f:
-            f.write(
-                """
+SERVICE_PROTO = b"""
 syntax = "proto3";
 
 package test.api;
@@ -71,16 +58,82 @@ message StreamResponse {
   bool is_last = 2;
 }
 """
-            )
 
+ANNOTATED_PROTO = b"""
+syntax = "proto3";
+
+package test.annotations;
+
+import "google/api/annotations.proto";
+
+/**
+ * Service with annotations
+ */
+service AnnotatedService {
+  /**
+   * Method with HTTP annotation
+   */
+  rpc GetResource(GetResourceRequest) returns (Resource) {
+    option (google.api.http) = {
+      get: "/v1/resources/{name}"
+    };
+  }
+
+  /**
+   * Method with additional options
+   */
+  rpc CreateResource(CreateResourceRequest) returns (Resource) {
+    option (google.api.http) = {
+      post: "/v1/resources"
+      body: "*"
+    };
+    option deprecated = true;
+  }
+}
+
+message GetResourceRequest {
+  string name = 1;
+}
+
+message CreateResourceRequest {
+  string parent = 1;
+  Resource resource = 2;
+}
+
+message Resource {
+  string name = 1;
+  string type = 2;
+  string data = 3;
+}
+"""
+
+
+class TestProtoApiGeneration(unittest.TestCase):
+    """Tests specifically focused on API documentation generation."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Create temporary directories once for all tests in this class
+        cls.temp_dir = tempfile.mkdtemp(dir=fast_tmpdir())
+        cls.proto_dir = os.path.join(cls.temp_dir, "proto")
+        os.makedirs(cls.proto_dir)
+        cls.output_dir = os.path.join(cls.temp_dir, "output")
+        os.makedirs(cls.output_dir)
+
+        # Create a service proto file with different API types
+        cls.service_proto_path = os.path.join(cls.proto_dir, "service.proto")
+        Path(cls.service_proto_path).write_bytes(SERVICE_PROTO)
+
+    @classmethod
+    def tearDownClass(cls):
+        # Clean up temp directory
+        remove_tmpdir(cls.temp_dir)
+
+    def setUp(self):
         # Initialize converter
         self.converter = ProtoToMarkdownConverter()
         self.converter.proto_dirs = [self.proto_dir]
 
-    def tearDown(self):
-        # Clean up temp directory
-        shutil.rmtree(self.temp_dir)
-
     def test_service_api_markdown_generation(self):
         """Test that all API method types are correctly documented."""
         proto_files = [self.service_proto_path]
@@ -94,8 +147,7 @@ message StreamResponse {
         self.assertTrue(os.path.exists(service_md_path))
 
         # Read the generated markdown
-        with open(service_md_path, "r") as f:
-            content = f.read()
+        content = Path(service_md_path).read_text(encoding="utf-8")
 
         # Check that the service and at least one method is documented
         self.assertIn("TestService", content)
@@ -119,8 +171,7 @@ message StreamResponse {
         service_md_path = os.path.join(self.output_dir, "service.md")
 
         # Read the generated markdown
-        with open(service_md_path, "r") as f:
-            content = f.read()
+        content = Path(service_md_path).read_text(encoding="utf-8")
 
         # Check for message fields
         self.assertIn("# UnaryRequest", content)
@@ -130,103 +181,176 @@ message StreamResponse {
         self.assertIn("results", content)
         self.assertIn("total_count", content)
 
+    def test_unchanged_proto_parsed_once(self):
+        """Test that converting an unchanged proto again reuses the parsed definitions."""
+        parse_calls = []
+        extract_messages = self.converter._extract_messages
+
+        def counting_extract_messages(content):
+            parse_calls.append(content)
+            return extract_messages(content)
+
+        self.converter._extract_messages = counting_extract_messages
+
+        scan_calls = []
+        scan_service_methods = self.converter._scan_service_methods
+
+        def counting_scan_service_methods(content):
+            scan_calls.append(content)
+            return scan_service_methods(content)
+
+        self.converter._scan_service_methods = counting_scan_service_methods
+
+        proto_files = [self.service_proto_path, self.service_proto_path]
+        generated_files = self.converter.convert_proto_files(proto_files, self.output_dir)
+        self.converter.convert_proto_files(proto_files, self.output_dir)
+
+        self.assertEqual(generated_files, [os.path.join(self.output_dir, "service.md")])
+        self.assertEqual(len(parse_calls), 1)
+        self.assertEqual(len(scan_calls), 1)
+
+    def test_parallel_conversion_matches_serial(self):
+        """Test that converting in worker processes gives the same files in the same order."""
+        proto_dir = os.path.join(self.temp_dir, "many")
+        os.makedirs(proto_dir)
+        proto_files = []
+        for i in range(PARALLEL_MIN_FILES):
+            proto_file = os.path.join(proto_dir, f"service_{i:02d}.proto")
+            Path(proto_file).write_bytes(SERVICE_PROTO)
+            proto_files.append(proto_file)
+        self.converter.proto_dirs = [proto_dir]
+
+        serial_dir = os.path.join(self.temp_dir, "serial")
+        serial_files = self.converter.convert_proto_files(proto_files, serial_dir)
+
+        # Record what the worker processes return, None means the pool failed and
+        # the files were converted in this process instead
+        pool_results = []
+        convert_in_processes = self.converter._convert_in_processes
+
+        def recording_convert_in_processes(files, out_dir):
+            result = convert_in_processes(files, out_dir)
+            pool_results.append(result)
+            return result
+
+        self.converter.parallel = True
+        parallel_dir = os.path.join(self.temp_dir, "parallel")
+        with mock.patch.object(
+            self.converter, "_convert_in_processes", side_effect=recording_convert_in_processes
+        ) as pool_conversion:
+            parallel_files = self.converter.convert_proto_files(proto_files, parallel_dir)
+
+        # The worker processes converted all files
+        pool_conversion.assert_called_once()
+        self.assertGreaterEqual(len(pool_conversion.call_args.args[0]), PARALLEL_MIN_FILES)
+        self.assertEqual(len(pool_results), 1)
+        self.assertIsNotNone(pool_results[0])
+
+        self.assertEqual(
+            [os.path.relpath(f, parallel_dir) for f in parallel_files],
+            [os.path.relpath(f, serial_dir) for f in serial_files],
+        )
+        for serial_file, parallel_file in zip(serial_files, parallel_files):
+            self.assertEqual(Path(parallel_file).read_bytes(), Path(serial_file).read_bytes())
+
+    def test_failed_conversion_keeps_previous_file(self):
+        """Test that a conversion error while streaming keeps the previous markdown file."""
+        output_dir = os.path.join(self.temp_dir, "failed_output")
+        service_md_path = os.path.join(output_dir, "service.md")
+
+        # A good build of the proto file
+        self.assertEqual(
+            self.converter.convert_proto_file(self.service_proto_path, output_dir),
+            service_md_path,
+        )
+        previous_content = Path(service_md_path).read_bytes()
 
-class TestProtoRpcAnnotations(unittest.TestCase):
-    """Tests for RPC method annotations and options."""
+        def failing_write_message(*args, **kwargs):
+            raise ValueError("broken message")
 
-    def setUp(self):
-        # Create temporary directories
-        self.temp_dir = tempfile.mkdtemp()
-        self.proto_dir = os.path.join(self.temp_dir, "proto")
-        os.makedirs(self.proto_dir)
-        self.output_dir = os.path.join(self.temp_dir, "output")
-        os.makedirs(self.output_dir)
+        self.converter._write_message = failing_write_message
 
-        # Create a service proto with annotations
-        self.annotated_proto_path = os.path.join(self.proto_dir, "annotated.proto")
-        with open(self.annotated_proto_path, "w") as f:
-            f.write(
-                """
-syntax = "proto3";
+        output_file = self.converter.convert_proto_file(self.service_proto_path, output_dir)
 
-package test.annotations;
+        # The previous markdown is kept and no partial file is left behind
+        self.assertIsNone(output_file)
+        self.assertEqual(Path(service_md_path).read_bytes(), previous_content)
+        self.assertEqual(os.listdir(output_dir), ["service.md"])
 
-import "google/api/annotations.proto";
+        # Without a previous build no markdown file is created at all
+        new_output_dir = os.path.join(self.temp_dir, "failed_new_output")
+        self.assertIsNone(
+            self.converter.convert_proto_file(self.service_proto_path, new_output_dir)
+        )
+        self.assertEqual(os.listdir(new_output_dir), [])
 
-/**
- * Service with annotations
- */
-service AnnotatedService {
-  /**
-   * Method with HTTP annotation
-   */
-  rpc GetResource(GetResourceRequest) returns (Resource) {
-    option (google.api.http) = {
-      get: "/v1/resources/{name}"
-    };
-  }
+    def test_output_file_mode(self):
+        """Test that new markdown files follow the umask and existing ones keep their mode."""
+        output_dir = os.path.join(self.temp_dir, "mode_output")
+        service_md_path = os.path.join(output_dir, "service.md")
 
-  /**
-   * Method with additional options
-   */
-  rpc CreateResource(CreateResourceRequest) returns (Resource) {
-    option (google.api.http) = {
-      post: "/v1/resources"
-      body: "*"
-    };
-    option deprecated = true;
-  }
-}
+        umask = os.umask(0o022)
+        try:
+            self.converter.convert_proto_file(self.service_proto_path, output_dir)
+        finally:
+            os.umask(umask)
+        self.assertEqual(stat.S_IMODE(os.stat(service_md_path).st_mode), 0o644)
 
-message GetResourceRequest {
-  string name = 1;
-}
+        # A mode set on the previous markdown file survives the next build
+        os.chmod(service_md_path, 0o600)
+        self.converter.convert_proto_file(self.service_proto_path, output_dir)
+        self.assertEqual(stat.S_IMODE(os.stat(service_md_path).st_mode), 0o600)
 
-message CreateResourceRequest {
-  string parent = 1;
-  Resource resource = 2;
-}
 
-message Resource {
-  string name = 1;
-  string type = 2;
-  string data = 3;
-}
-"""
-            )
+class TestProtoRpcAnnotations(unittest.TestCase):
+    """Tests for RPC method annotations and options."""
 
-        # Initialize converter
-        self.converter = ProtoToMarkdownConverter()
-        self.converter.proto_dirs = [self.proto_dir]
+    @classmethod
+    def setUpClass(cls):
+        # Create temporary directories once for all tests in this class
+        cls.temp_dir = tempfile.mkdtemp(dir=fast_tmpdir())
+        cls.proto_dir = os.path.join(cls.temp_dir, "proto")
+        os.makedirs(cls.proto_dir)
+        cls.output_dir = os.path.join(cls.temp_dir, "output")
+        os.makedirs(cls.output_dir)
 
-    def tearDown(self):
+        # Create a service proto with annotations
+        cls.annotated_proto_path = os.path.join(cls.proto_dir, "annotated.proto")
+        Path(cls.annotated_proto_path).write_bytes(ANNOTATED_PROTO)
+
+        # Convert the proto once, the tests only read the generated markdown
+        converter = ProtoToMarkdownConverter()
+        converter.proto_dirs = [cls.proto_dir]
+        cls.generated_files = converter.convert_proto_files(
+            [cls.annotated_proto_path], cls.output_dir
+        )
+        cls.annotated_md_path = os.path.join(cls.output_dir, "annotated.md")
+
+    @classmethod
+    def tearDownClass(cls):
         # Clean up temp directory
-        shutil.rmtree(self.temp_dir)
+        remove_tmpdir(cls.temp_dir)
+
+    def test_annotated_service_documented(self):
+        """Test that a service with annotated methods is documented."""
+        self.assertEqual(self.generated_files, [self.annotated_md_path])
+        content = Path(self.annotated_md_path).read_text(encoding="utf-8")
 
+        self.assertIn("AnnotatedService", content)
+        self.assertIn("GetResource", content)
+
+    @unittest.skipUnless(
+        ProtoToMarkdownConverter.supports_annotations,
+        "RPC annotations are not supported by the converter",
+    )
     def test_rpc_annotations_documented(self):
         """Test that RPC annotations are properly documented when present."""
-        # This test might be skipped if the plugin doesn't yet handle annotations
-        try:
-            proto_files = [self.annotated_proto_path]
-            # Convert proto files to markdown (result not used but function called for side effects)
-            self.converter.convert_proto_files(
-                proto_files, self.output_dir
-            )
-
-            # Check if the file was generated (it might fail due to missing imports)
-            annotated_md_path = os.path.join(self.output_dir, "annotated.md")
-            if os.path.exists(annotated_md_path):
-                with open(annotated_md_path, "r") as f:
-                    content = f.read()
-
-                # Check for annotation documentation if supported
-                self.assertIn("AnnotatedService", content)
-            else:
-                self.skipTest(
-                    "Annotation handling not fully supported yet - imports might be missing"
-                )
-        except Exception as e:
-            self.skipTest(f"Annotation handling test skipped: {str(e)}")
+        content = Path(self.annotated_md_path).read_text(encoding="utf-8")
+
+        # Both methods and their HTTP rules are documented
+        self.assertIn("CreateResource", content)
+        self.assertIn("/v1/resources/{name}", content)
+        self.assertIn("/v1/resources", content)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,101 @@
+import unittest
+import tempfile
+import os
+import io
+import shutil
+from contextlib import redirect_stdout
+from unittest import mock
+
+from test import fast_tmpdir, remove_tmpdir
+from test import test_setup
+
+
+class TestExampleSetup(unittest.TestCase):
+    """Test that the test project is only rebuilt when something changed."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp(dir=fast_tmpdir())
+        self.project_dir = os.path.join(self.temp_dir, "test-project")
+
+        # A copy of the plugin sources that the tests can edit
+        self.plugin_dir = os.path.join(self.temp_dir, "mkdocs_protobuf_plugin")
+        shutil.copytree(
+            test_setup._plugin_dir(),
+            self.plugin_dir,
+            ignore=shutil.ignore_patterns("__pycache__"),
+        )
+        patcher = mock.patch.object(
+            test_setup, "_plugin_dir", return_value=self.plugin_dir
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # A project as left behind by a successful build
+        with redirect_stdout(io.StringIO()):
+            test_setup.setup_test_project(self.project_dir)
+        os.makedirs(os.path.join(self.project_dir, "site"))
+        test_setup.save_manifest(self.project_dir)
+
+    def tearDown(self):
+        remove_tmpdir(self.temp_dir)
+
+    def _run_main(self, *args):
+        """Run the setup script with a stubbed build, return the build mock"""
+        argv = ["test_setup.py", self.project_dir, *args]
+        with mock.patch("sys.argv", argv), mock.patch.object(
+            test_setup, "build_site"
+        ) as build_site, redirect_stdout(io.StringIO()):
+            test_setup.main()
+        return build_site
+
+    def test_unchanged_project_is_skipped(self):
+        """Test that a project built from the current files is not rebuilt."""
+        self.assertTrue(test_setup.is_up_to_date(self.project_dir))
+        self._run_main().assert_not_called()
+
+    def test_edited_proto_triggers_rebuild(self):
+        """Test that editing a proto file of the project triggers a rebuild."""
+        user_proto = os.path.join(self.project_dir, "proto", "user.proto")
+        with open(user_proto, "ab") as f:
+            f.write(b"\n// edited\n")
+
+        self.assertFalse(test_setup.is_up_to_date(self.project_dir))
+        self._run_main().assert_called_once()
+
+        # The sample content is restored before the build
+        with open(user_proto, "rb") as f:
+            self.assertEqual(f.read(), test_setup.SAMPLE_USER_PROTO)
+
+    def test_missing_site_triggers_rebuild(self):
+        """Test that a project without a built site is rebuilt."""
+        shutil.rmtree(os.path.join(self.project_dir, "site"))
+
+        self.assertFalse(test_setup.is_up_to_date(self.project_dir))
+        self._run_main().assert_called_once()
+
+    def test_changed_plugin_source_triggers_rebuild(self):
+        """Test that changing the plugin sources triggers a rebuild."""
+        with open(os.path.join(self.plugin_dir, "converter.py"), "ab") as f:
+            f.write(b"\n# edited\n")
+
+        self.assertFalse(test_setup.is_up_to_date(self.project_dir))
+        self._run_main().assert_called_once()
+
+    def test_force_triggers_rebuild(self):
+        """Test that --force rebuilds a project that is up to date."""
+        self.assertTrue(test_setup.is_up_to_date(self.project_dir))
+        self._run_main("--force").assert_called_once()
+
+    def test_write_if_changed(self):
+        """Test that files already holding the content are not written again."""
+        path = os.path.join(self.temp_dir, "sample.proto")
+
+        self.assertTrue(test_setup.write_if_changed(path, b"syntax = 1;"))
+        self.assertFalse(test_setup.write_if_changed(path, b"syntax = 1;"))
+        self.assertTrue(test_setup.write_if_changed(path, b"syntax = 2;"))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"syntax = 2;")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,36 +3,50 @@ import tempfile
 import os
 import json
 import hashlib
-import shutil
+from unittest import mock
+from pathlib import Path
 
 from mkdocs_protobuf_plugin.file_cache import ProtoFileCache
+from test import fast_tmpdir, remove_tmpdir
 
+TEST_PROTO = b"""
+syntax = "proto3";
 
-class TestProtoFileCache(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory for the cache and test files
-        self.temp_dir = tempfile.mkdtemp()
-        self.cache_file = os.path.join(self.temp_dir, "test_cache.json")
+package test;
 
-        # Create a test file
-        self.test_file = os.path.join(self.temp_dir, "test.proto")
-        with open(self.test_file, "w") as f:
-            f.write("""
+message TestMessage {
+    string name = 1;
+}
+"""
+
+MODIFIED_TEST_PROTO = b"""
 syntax = "proto3";
 
 package test;
 
 message TestMessage {
     string name = 1;
+    string description = 2;  // Added a new field
 }
-""")
+"""
+
+
+class TestProtoFileCache(unittest.TestCase):
+    def setUp(self):
+        # Create a temporary directory for the cache and test files
+        self.temp_dir = tempfile.mkdtemp(dir=fast_tmpdir())
+        self.cache_file = os.path.join(self.temp_dir, "test_cache.json")
+
+        # Create a test file
+        self.test_file = os.path.join(self.temp_dir, "test.proto")
+        Path(self.test_file).write_bytes(TEST_PROTO)
 
         # Initialize cache
         self.cache = ProtoFileCache(cache_file=self.cache_file)
 
     def tearDown(self):
         # Clean up the temporary directory
-        shutil.rmtree(self.temp_dir)
+        remove_tmpdir(self.temp_dir)
 
     def test_cache_initialization(self):
         """Test that the cache initializes correctly"""
@@ -47,7 +61,7 @@ message TestMessage {
         # Calculate expected hash manually
         with open(self.test_file, 'rb') as f:
             content = f.read()
-            expected_hash = hashlib.md5(content).hexdigest()
+            expected_hash = hashlib.blake2b(content, digest_size=16).hexdigest()
 
         self.assertEqual(file_hash, expected_hash)
 
@@ -63,25 +77,46 @@ message TestMessage {
         self.assertFalse(self.cache.is_file_changed(self.test_file))
 
         # Modify the file
-        with open(self.test_file, "w") as f:
-            f.write("""
-syntax = "proto3";
-
-package test;
-
-message TestMessage {
-    string name = 1;
-    string description = 2;  // Added a new field
-}
-""")
+        Path(self.test_file).write_bytes(MODIFIED_TEST_PROTO)
 
         # The file should now be considered changed
         self.assertTrue(self.cache.is_file_changed(self.test_file))
 
+    def test_unchanged_stat_skips_hashing(self):
+        """Test that files with unchanged size and mtime are not re-hashed"""
+        self.cache.update_file_hash(self.test_file)
+
+        def fail_hash(file_path):
+            raise AssertionError("file should not be hashed")
+
+        self.cache.get_file_hash = fail_hash
+        self.assertFalse(self.cache.is_file_changed(self.test_file))
+
+    def test_known_stat_result_reused(self):
+        """Test that a stat result passed by the caller is used instead of a new stat"""
+        self.cache.update_file_hash(self.test_file)
+        stat = os.stat(self.test_file)
+
+        with mock.patch("os.stat", side_effect=AssertionError("file should not be stat'ed")):
+            self.assertFalse(self.cache.is_file_changed(self.test_file, stat))
+
+    def test_touched_file_not_changed(self):
+        """Test that a new mtime with identical content is not a change"""
+        self.cache.update_file_hash(self.test_file)
+        stat = os.stat(self.test_file)
+        os.utime(self.test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertFalse(self.cache.is_file_changed(self.test_file))
+
+        # The refreshed stat is remembered for the next check
+        entry = self.cache.file_hashes[os.path.abspath(self.test_file)]
+        self.assertEqual(entry["mtime_ns"], stat.st_mtime_ns + 10**9)
+
     def test_cache_persistence(self):
         """Test that the cache is persisted to disk"""
-        # Update the cache
+        # Update the cache and save it
         self.cache.update_file_hash(self.test_file)
+        self.cache.save_cache()
 
         # Check if cache file was created
         self.assertTrue(os.path.exists(self.cache_file))
@@ -100,6 +135,38 @@ message TestMessage {
         # The file should not be considered changed with the new cache instance
         self.assertFalse(new_cache.is_file_changed(self.test_file))
 
+    def test_updates_saved_in_batch(self):
+        """Test that updates are only written to disk when the cache is saved"""
+        self.cache.update_file_hash(self.test_file)
+        self.assertTrue(self.cache.dirty)
+        self.assertFalse(os.path.exists(self.cache_file))
+
+        self.cache.save_cache()
+        self.assertFalse(self.cache.dirty)
+        self.assertTrue(os.path.exists(self.cache_file))
+
+        # Saving without pending updates does not rewrite the file
+        os.remove(self.cache_file)
+        self.cache.save_cache()
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_failed_save_keeps_previous_cache(self):
+        """Test that a failed save leaves the previous cache file intact"""
+        self.cache.update_file_hash(self.test_file)
+        self.cache.save_cache()
+        with open(self.cache_file, 'rb') as f:
+            saved = f.read()
+
+        # An entry that cannot be serialized makes the write fail halfway
+        self.cache.file_hashes["broken"] = object()
+        self.cache.dirty = True
+        self.cache.save_cache()
+
+        with open(self.cache_file, 'rb') as f:
+            self.assertEqual(f.read(), saved)
+        self.assertTrue(self.cache.dirty)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ["test.proto", "test_cache.json"])
+
 
 if __name__ == "__main__":
     unittest.main()
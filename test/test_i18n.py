@@ -1,11 +1,12 @@
 import unittest
 import tempfile
 import os
-import shutil
-import copy
+from pathlib import Path
+from unittest import mock
 
 from mkdocs_protobuf_plugin.plugin import ProtobufPlugin
 from mkdocs_protobuf_plugin.i18n_support import I18nSupport
+from test import fast_tmpdir, fork_config, remove_tmpdir
 
 
 class TestI18nSupport(unittest.TestCase):
@@ -13,7 +14,7 @@ class TestI18nSupport(unittest.TestCase):
 
     def setUp(self):
         # Create a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = tempfile.mkdtemp(dir=fast_tmpdir())
 
         # Initialize plugin
         self.plugin = ProtobufPlugin()
@@ -47,7 +48,7 @@ class TestI18nSupport(unittest.TestCase):
 
     def tearDown(self):
         # Clean up
-        shutil.rmtree(self.temp_dir)
+        remove_tmpdir(self.temp_dir)
 
     def test_i18n_plugin_detection(self):
         """Test that the i18n plugin is correctly detected."""
@@ -55,7 +56,7 @@ class TestI18nSupport(unittest.TestCase):
         self.assertTrue(is_active, "i18n plugin should be detected as active")
 
         # Test with config without i18n
-        config_no_i18n = copy.deepcopy(self.mkdocs_config)
+        config_no_i18n = fork_config(self.mkdocs_config)
         config_no_i18n['plugins'] = ['search']
         self.assertFalse(
             I18nSupport.is_i18n_active(config_no_i18n),
@@ -75,6 +76,36 @@ class TestI18nSupport(unittest.TestCase):
         default_lang = I18nSupport.get_default_language(self.mkdocs_config)
         self.assertEqual(default_lang, 'en', "Should extract 'en' as default language")
 
+    def test_i18n_config_follows_plugin_changes(self):
+        """Test that changing the plugins in place is seen by the next lookup."""
+        config = fork_config(self.mkdocs_config)
+        config['plugins'] = ['search']
+        self.assertFalse(I18nSupport.is_i18n_active(config))
+
+        config['plugins'].append({'i18n': {'default_language': 'de', 'languages': ['de']}})
+        self.assertTrue(I18nSupport.is_i18n_active(config))
+        self.assertEqual(I18nSupport.get_languages(config), ['de'])
+        self.assertEqual(I18nSupport.get_default_language(config), 'de')
+
+    def test_i18n_config_extracted_once_per_build(self):
+        """Test that the plugin extracts the i18n configuration once per build."""
+        self.plugin.config = {'proto_paths': [], 'output_dir': 'api'}
+        config = fork_config(self.mkdocs_config)
+
+        with mock.patch.object(
+            I18nSupport, 'get_i18n_config', wraps=I18nSupport.get_i18n_config
+        ) as get_i18n_config:
+            first = self.plugin._get_i18n_config(config)
+            self.assertIs(self.plugin._get_i18n_config(config), first)
+            self.assertEqual(get_i18n_config.call_count, 1)
+            self.assertEqual(first.languages, ['en', 'fr', 'es'])
+
+            # A new build extracts the configuration again
+            config['plugins'] = ['search']
+            self.plugin.on_config(config)
+            self.assertFalse(self.plugin._get_i18n_config(config).active)
+            self.assertEqual(get_i18n_config.call_count, 2)
+
     def test_i18n_navigation_update(self):
         """Test that navigation is correctly updated for a specific language."""
         nav = []
@@ -120,8 +151,7 @@ class TestI18nSupport(unittest.TestCase):
 
         # Create empty test files
         for file_path in generated_files:
-            with open(file_path, 'w') as f:
-                f.write('# Test API')
+            Path(file_path).write_bytes(b'# Test API')
 
         # Mock the _are_files_in_nav method to return False so _update_navigation will proceed
         self.plugin._are_files_in_nav = lambda nav, generated_files, docs_dir: False
@@ -130,7 +160,7 @@ class TestI18nSupport(unittest.TestCase):
         self.plugin._build_nav_tree = lambda file_paths: [{'Test': file_paths[0]}]
 
         # Call _update_navigation
-        config = copy.deepcopy(self.mkdocs_config)
+        config = fork_config(self.mkdocs_config)
         config['nav'] = nav
         self.plugin._update_navigation(config, 'api', generated_files)
 
@@ -1,54 +1,31 @@
 import unittest
 import tempfile
 import os
-import shutil
 import copy
+from pathlib import Path
 
+from mkdocs_protobuf_plugin.file_cache import ProtoFileCache
 from mkdocs_protobuf_plugin.plugin import ProtobufPlugin
+from test import fast_tmpdir, fork_config, remove_tmpdir
 
-
-class TestNavigation(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
-
-        # Create proto directory
-        self.proto_dir = os.path.join(self.temp_dir, "proto")
-        os.makedirs(self.proto_dir)
-
-        # Create nested proto directories
-        self.example_dir = os.path.join(self.proto_dir, "example", "document", "v1")
-        os.makedirs(self.example_dir, exist_ok=True)
-
-        # Create output directory
-        self.output_dir = os.path.join(self.temp_dir, "docs", "api")
-        os.makedirs(os.path.join(self.temp_dir, "docs"), exist_ok=True)
-
-        # Create test proto files
-        self.test_proto_file = os.path.join(self.proto_dir, "test.proto")
-        with open(self.test_proto_file, "w") as f:
-            f.write("""
+TEST_PROTO = b"""
 syntax = "proto3";
 package test;
 message TestMessage {
     string name = 1;
 }
-""")
+"""
 
-        self.user_proto_file = os.path.join(self.proto_dir, "user.proto")
-        with open(self.user_proto_file, "w") as f:
-            f.write("""
+USER_PROTO = b"""
 syntax = "proto3";
 package user;
 message User {
     string id = 1;
     string name = 2;
 }
-""")
+"""
 
-        self.service_proto_file = os.path.join(self.example_dir, "service.proto")
-        with open(self.service_proto_file, "w") as f:
-            f.write("""
+SERVICE_PROTO = b"""
 syntax = "proto3";
 package example.document.v1;
 message Document {
@@ -61,10 +38,52 @@ service DocumentService {
 message GetDocumentRequest {
     string document_id = 1;
 }
-""")
+"""
+
+
+# Proto corpus shared by all tests in this module, it is only read by the tests
+CORPUS_DIR = None
+PROTO_DIR = None
 
-        # Initialize plugin
+
+def setUpModule():
+    global CORPUS_DIR, PROTO_DIR
+
+    # Create proto directory
+    CORPUS_DIR = tempfile.mkdtemp(dir=fast_tmpdir())
+    PROTO_DIR = os.path.join(CORPUS_DIR, "proto")
+
+    # Create nested proto directories
+    example_dir = os.path.join(PROTO_DIR, "example", "document", "v1")
+    os.makedirs(example_dir)
+
+    # Create test proto files
+    Path(os.path.join(PROTO_DIR, "test.proto")).write_bytes(TEST_PROTO)
+
+    Path(os.path.join(PROTO_DIR, "user.proto")).write_bytes(USER_PROTO)
+
+    Path(os.path.join(example_dir, "service.proto")).write_bytes(SERVICE_PROTO)
+
+
+def tearDownModule():
+    remove_tmpdir(CORPUS_DIR)
+
+
+class TestNavigation(unittest.TestCase):
+    def setUp(self):
+        # Create a temporary directory for the generated docs and the cache
+        self.temp_dir = tempfile.mkdtemp(dir=fast_tmpdir())
+        self.proto_dir = PROTO_DIR
+
+        # Create output directory
+        self.output_dir = os.path.join(self.temp_dir, "docs", "api")
+        os.makedirs(os.path.join(self.temp_dir, "docs"), exist_ok=True)
+
+        # Initialize plugin, with a cache of its own so every test converts the corpus
         self.plugin = ProtobufPlugin()
+        self.plugin.file_cache = ProtoFileCache(
+            cache_file=os.path.join(self.temp_dir, "cache.json")
+        )
         self.plugin.config = {
             'proto_paths': [self.proto_dir],
             'output_dir': 'api'
@@ -78,7 +97,7 @@ message GetDocumentRequest {
 
     def tearDown(self):
         # Clean up
-        shutil.rmtree(self.temp_dir)
+        remove_tmpdir(self.temp_dir)
 
     def test_auto_nav_generation(self):
         """Test that navigation is auto-generated correctly"""
@@ -92,7 +111,7 @@ message GetDocumentRequest {
         self.assertEqual(len(generated_files), 3)
 
         # Create a copy of the config to work with
-        config = copy.deepcopy(self.mkdocs_config)
+        config = fork_config(self.mkdocs_config)
 
         # Update navigation
         self.plugin._update_navigation(config, 'api', generated_files)
@@ -117,6 +136,55 @@ message GetDocumentRequest {
 
         self.assertTrue(has_structure, "Navigation should have some structure")
 
+    def test_unchanged_file_set_skips_nav_rebuild(self):
+        """Test that the nav is not rebuilt when the generated file set is unchanged"""
+        generated_files = self.plugin._process_proto_files(
+            [self.proto_dir],
+            self.output_dir
+        )
+        config = fork_config(self.mkdocs_config)
+
+        # Count how often the nav gets inspected
+        nav_checks = []
+        are_files_in_nav = self.plugin._are_files_in_nav
+
+        def counting_are_files_in_nav(nav, files, docs_dir):
+            nav_checks.append(files)
+            return are_files_in_nav(nav, files, docs_dir)
+
+        self.plugin._are_files_in_nav = counting_are_files_in_nav
+
+        self.plugin._update_navigation(config, 'api', generated_files)
+        self.assertEqual(len(nav_checks), 1)
+
+        # Same file set in a different order is skipped without walking the nav
+        self.plugin._update_navigation(config, 'api', list(reversed(generated_files)))
+        self.assertEqual(len(nav_checks), 1)
+
+        # A fresh nav with the same file set is still updated
+        fresh_config = fork_config(self.mkdocs_config)
+        self.plugin._update_navigation(fresh_config, 'api', generated_files)
+        self.assertEqual(len(nav_checks), 2)
+        self.assertIn('API Reference', fresh_config['nav'][0])
+
+    def test_files_in_nav_detection(self):
+        """Test that files are found anywhere in a nested nav"""
+        docs_dir = self.mkdocs_config['docs_dir']
+        nav = [
+            {'Home': 'index.md'},
+            {'API Reference': [
+                'api/test.md',
+                {'Document API': {'Service': 'api/example/document/v1/service.md'}}
+            ]}
+        ]
+
+        self.assertTrue(self.plugin._are_files_in_nav(
+            nav, ['api/test.md', os.path.join(docs_dir, 'api', 'example', 'document', 'v1', 'service.md')], docs_dir
+        ))
+        self.assertFalse(self.plugin._are_files_in_nav(
+            nav, ['api/test.md', 'api/user.md'], docs_dir
+        ))
+
     def test_custom_nav_preservation(self):
         """Test that custom navigation is preserved"""
         # Process the files
@@ -126,7 +194,7 @@ message GetDocumentRequest {
         )
 
         # Create a config with custom navigation
-        config = copy.deepcopy(self.mkdocs_config)
+        config = fork_config(self.mkdocs_config)
         config['nav'] = [
             {'Home': 'index.md'},
             {'API Reference': [
@@ -1,40 +1,13 @@
 import unittest
 import tempfile
 import os
-import shutil
+from pathlib import Path
 
 from mkdocs_protobuf_plugin.converter import ProtoToMarkdownConverter
 from mkdocs_protobuf_plugin.import_resolver import ProtoImportResolver
+from test import fast_tmpdir, remove_tmpdir
 
-
-class TestNestedStructure(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory for test proto files
-        self.temp_dir = tempfile.mkdtemp()
-
-        # Create a nested directory structure for proto files
-        self.example_dir = os.path.join(
-            self.temp_dir, "proto", "example", "document", "v1"
-        )
-        os.makedirs(self.example_dir)
-
-        self.user_dir = os.path.join(self.temp_dir, "proto", "example", "user", "v1")
-        os.makedirs(self.user_dir)
-
-        self.common_dir = os.path.join(
-            self.temp_dir, "proto", "example", "common", "v1"
-        )
-        os.makedirs(self.common_dir)
-
-        # Create output directory
-        self.output_dir = os.path.join(self.temp_dir, "output")
-        os.makedirs(self.output_dir)
-
-        # Create proto files
-        self.common_proto_path = os.path.join(self.common_dir, "common.proto")
-        with open(self.common_proto_path, "w") as f:
-            f.write(
-                """
+COMMON_PROTO = b"""
 syntax = "proto3";
 
 package example.common.v1;
@@ -59,12 +32,8 @@ message Status {
   string message = 2;
 }
 """
-            )
 
-        self.user_proto_path = os.path.join(self.user_dir, "user.proto")
-        with open(self.user_proto_path, "w") as f:
-            f.write(
-                """
+USER_PROTO = b"""
 syntax = "proto3";
 
 package example.user.v1;
@@ -113,12 +82,8 @@ message GetUserRequest {
   string user_id = 1;
 }
 """
-            )
 
-        self.document_proto_path = os.path.join(self.example_dir, "document.proto")
-        with open(self.document_proto_path, "w") as f:
-            f.write(
-                """
+DOCUMENT_PROTO = b"""
 syntax = "proto3";
 
 package example.document.v1;
@@ -199,51 +164,84 @@ message DeleteResponse {
   example.common.v1.Status status = 1;
 }
 """
-            )
 
-        # Initialize converter
-        self.converter = ProtoToMarkdownConverter()
-        self.converter.proto_dirs = [os.path.join(self.temp_dir, "proto")]
 
-    def tearDown(self):
+class TestNestedStructure(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Create the proto tree once for all tests in this class
+        cls.temp_dir = tempfile.mkdtemp(dir=fast_tmpdir())
+
+        # Create a nested directory structure for proto files
+        cls.example_dir = os.path.join(
+            cls.temp_dir, "proto", "example", "document", "v1"
+        )
+        cls.user_dir = os.path.join(cls.temp_dir, "proto", "example", "user", "v1")
+        cls.common_dir = os.path.join(
+            cls.temp_dir, "proto", "example", "common", "v1"
+        )
+        cls.common_proto_path = os.path.join(cls.common_dir, "common.proto")
+        cls.user_proto_path = os.path.join(cls.user_dir, "user.proto")
+        cls.document_proto_path = os.path.join(cls.example_dir, "document.proto")
+
+        # Create proto files, along with their parent directories
+        for path, body in [
+            (cls.common_proto_path, COMMON_PROTO),
+            (cls.user_proto_path, USER_PROTO),
+            (cls.document_proto_path, DOCUMENT_PROTO),
+        ]:
+            proto_path = Path(path)
+            proto_path.parent.mkdir(parents=True, exist_ok=True)
+            proto_path.write_bytes(body)
+
+        # Create output directory
+        cls.output_dir = os.path.join(cls.temp_dir, "output")
+        os.mkdir(cls.output_dir)
+
+        # Resolve and convert the proto tree once, the tests only read the results
+        cls.proto_files = [
+            cls.common_proto_path,
+            cls.user_proto_path,
+            cls.document_proto_path,
+        ]
+        cls.resolver = ProtoImportResolver([os.path.join(cls.temp_dir, "proto")])
+        cls.resolver.initialize(cls.proto_files)
+
+        cls.converter = ProtoToMarkdownConverter()
+        cls.converter.proto_dirs = [os.path.join(cls.temp_dir, "proto")]
+        cls.generated_files = cls.converter.convert_proto_files(
+            cls.proto_files, cls.output_dir
+        )
+
+        # Walk the output tree once, the tests check paths against these sets
+        cls.output_dirs = set()
+        cls.output_files = set()
+        for root, dirs, files in os.walk(cls.output_dir):
+            cls.output_dirs.update(os.path.join(root, name) for name in dirs)
+            cls.output_files.update(os.path.join(root, name) for name in files)
+
+    @classmethod
+    def tearDownClass(cls):
         # Clean up temp directory
-        shutil.rmtree(self.temp_dir)
+        remove_tmpdir(cls.temp_dir)
 
     def test_nested_imports_resolution(self):
         """Test that imports in nested directories are correctly resolved"""
-        # Initialize the import resolver
-        resolver = ProtoImportResolver([os.path.join(self.temp_dir, "proto")])
-        proto_files = [
-            self.common_proto_path,
-            self.user_proto_path,
-            self.document_proto_path,
-        ]
-        resolver.initialize(proto_files)
-
         # Test resolving imports from document.proto
-        user_import = resolver.resolve_import(
+        user_import = self.resolver.resolve_import(
             "example/user/v1/user.proto", self.document_proto_path
         )
         self.assertEqual(user_import, self.user_proto_path)
 
-        common_import = resolver.resolve_import(
+        common_import = self.resolver.resolve_import(
             "example/common/v1/common.proto", self.document_proto_path
         )
         self.assertEqual(common_import, self.common_proto_path)
 
     def test_nested_directory_conversion(self):
         """Test that proto files in nested directories are converted correctly"""
-        proto_files = [
-            self.common_proto_path,
-            self.user_proto_path,
-            self.document_proto_path,
-        ]
-        generated_files = self.converter.convert_proto_files(
-            proto_files, self.output_dir
-        )
-
         # Check that the correct number of files were generated
-        self.assertEqual(len(generated_files), 3)
+        self.assertEqual(len(self.generated_files), 3)
 
         # Check that the files were created with the correct paths
         expected_paths = [
@@ -253,8 +251,8 @@ message DeleteResponse {
         ]
 
         for expected_path in expected_paths:
-            self.assertTrue(
-                os.path.exists(expected_path), f"Expected {expected_path} to exist"
+            self.assertIn(
+                expected_path, self.output_files, f"Expected {expected_path} to exist"
             )
 
     def test_nested_cross_references(self):
@@ -264,8 +262,7 @@ message DeleteResponse {
         document_md_path = os.path.join(
             self.output_dir, "example", "document", "v1", "document.md"
         )
-        with open(document_md_path, "r") as f:
-            content = f.read()
+        content = Path(document_md_path).read_text(encoding="utf-8")
 
         # Check for references to the User and Timestamp messages
         # The exact format of links may vary, but they should include references to the user and common directories
@@ -277,8 +274,7 @@ message DeleteResponse {
 
         # Check that user.md has proper links to common.md
         user_md_path = os.path.join(self.output_dir, "example", "user", "v1", "user.md")
-        with open(user_md_path, "r") as f:
-            content = f.read()
+        content = Path(user_md_path).read_text(encoding="utf-8")
 
         # Check for references to the Timestamp message
         self.assertIn("Timestamp", content)
@@ -286,20 +282,19 @@ message DeleteResponse {
     def test_navigation_structure(self):
         """Test that the navigation structure is built correctly"""
 
-        # Check that all necessary directories were created
+        # Check that all necessary directories were created, a leaf directory
+        # can only exist if all of its parents do
+        example_dir = os.path.join(self.output_dir, "example")
         expected_dirs = [
-            os.path.join(self.output_dir, "example"),
-            os.path.join(self.output_dir, "example", "common"),
-            os.path.join(self.output_dir, "example", "common", "v1"),
-            os.path.join(self.output_dir, "example", "user"),
-            os.path.join(self.output_dir, "example", "user", "v1"),
-            os.path.join(self.output_dir, "example", "document"),
-            os.path.join(self.output_dir, "example", "document", "v1"),
+            os.path.join(example_dir, "common", "v1"),
+            os.path.join(example_dir, "user", "v1"),
+            os.path.join(example_dir, "document", "v1"),
         ]
 
         for expected_dir in expected_dirs:
-            self.assertTrue(
-                os.path.isdir(expected_dir),
+            self.assertIn(
+                expected_dir,
+                self.output_dirs,
                 f"Expected directory {expected_dir} to exist",
             )
 
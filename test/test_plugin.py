@@ -1,31 +1,15 @@
 import unittest
 import tempfile
 import os
-import shutil
+from unittest import mock
+from pathlib import Path
 
 from mkdocs_protobuf_plugin.converter import ProtoToMarkdownConverter
 from mkdocs_protobuf_plugin.import_resolver import ProtoImportResolver
 from mkdocs_protobuf_plugin.plugin import ProtobufPlugin
+from test import fast_tmpdir, remove_tmpdir
 
-
-class TestProtoImportResolver(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory for test proto files
-        self.temp_dir = tempfile.mkdtemp()
-
-        # Create some test proto files
-        self.example_dir = os.path.join(self.temp_dir, "example", "document", "v1")
-        os.makedirs(self.example_dir)
-
-        # Create test proto files
-        self.user_proto_path = os.path.join(self.temp_dir, "user.proto")
-        self.data_proto_path = os.path.join(self.example_dir, "data.proto")
-        self.service_proto_path = os.path.join(self.example_dir, "service.proto")
-
-        # Write content to test proto files
-        with open(self.user_proto_path, "w") as f:
-            f.write(
-                """
+RESOLVER_USER_PROTO = b"""
 syntax = "proto3";
 
 package user;
@@ -36,11 +20,8 @@ message User {
   string email = 3;
 }
 """
-            )
 
-        with open(self.data_proto_path, "w") as f:
-            f.write(
-                """
+RESOLVER_DATA_PROTO = b"""
 syntax = "proto3";
 
 package example.document.v1;
@@ -54,11 +35,8 @@ message Document {
   user.User creator = 4;
 }
 """
-            )
 
-        with open(self.service_proto_path, "w") as f:
-            f.write(
-                """
+RESOLVER_SERVICE_PROTO = b"""
 syntax = "proto3";
 
 package example.document.v1;
@@ -73,72 +51,8 @@ message GetDocumentRequest {
   string document_id = 1;
 }
 """
-            )
-
-        # Initialize the resolver
-        self.resolver = ProtoImportResolver([self.temp_dir])
-        proto_files = [
-            self.user_proto_path,
-            self.data_proto_path,
-            self.service_proto_path,
-        ]
-        self.resolver.initialize(proto_files)
-
-    def tearDown(self):
-        # Remove the temporary directory
-        shutil.rmtree(self.temp_dir)
-
-    def test_resolve_import(self):
-        """Test that imports are correctly resolved"""
-        # Test resolving user.proto
-        resolved_path = self.resolver.resolve_import("user.proto", self.data_proto_path)
-        self.assertEqual(resolved_path, self.user_proto_path)
-
-        # Test resolving data.proto from service.proto
-        resolved_path = self.resolver.resolve_import(
-            "example/document/v1/data.proto", self.service_proto_path
-        )
-        self.assertEqual(resolved_path, self.data_proto_path)
 
-    def test_package_map(self):
-        """Test that package map is properly populated"""
-        # Test getting user package file
-        self.assertIn("user", self.resolver.package_map)
-        self.assertEqual(self.resolver.package_map["user"], self.user_proto_path)
-
-        # Test getting example.document.v1 package file
-        self.assertIn("example.document.v1", self.resolver.package_map)
-        # The package map only has one entry per package, not multiple files
-        self.assertTrue(
-            self.resolver.package_map["example.document.v1"] == self.data_proto_path
-            or self.resolver.package_map["example.document.v1"]
-            == self.service_proto_path
-        )
-
-
-class TestProtoToMarkdownConverter(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory for test output
-        self.temp_dir = tempfile.mkdtemp()
-        self.output_dir = os.path.join(self.temp_dir, "output")
-        os.makedirs(self.output_dir)
-
-        # Create test proto content directory
-        self.proto_dir = os.path.join(self.temp_dir, "proto")
-        os.makedirs(self.proto_dir)
-
-        self.example_dir = os.path.join(self.proto_dir, "example", "document", "v1")
-        os.makedirs(self.example_dir)
-
-        # Create test proto files
-        self.user_proto_path = os.path.join(self.proto_dir, "user.proto")
-        self.data_proto_path = os.path.join(self.example_dir, "data.proto")
-        self.service_proto_path = os.path.join(self.example_dir, "service.proto")
-
-        # Write content to test proto files
-        with open(self.user_proto_path, "w") as f:
-            f.write(
-                """
+DOCUMENTED_USER_PROTO = b"""
 syntax = "proto3";
 
 package user;
@@ -157,11 +71,8 @@ message User {
   string email = 3;
 }
 """
-            )
 
-        with open(self.data_proto_path, "w") as f:
-            f.write(
-                """
+DOCUMENTED_DATA_PROTO = b"""
 syntax = "proto3";
 
 package example.document.v1;
@@ -185,11 +96,8 @@ message Document {
   user.User creator = 4;
 }
 """
-            )
 
-        with open(self.service_proto_path, "w") as f:
-            f.write(
-                """
+DOCUMENTED_SERVICE_PROTO = b"""
 syntax = "proto3";
 
 package example.document.v1;
@@ -214,29 +122,131 @@ message GetDocumentRequest {
   string document_id = 1;
 }
 """
-            )
 
-        # Initialize the converter
-        self.converter = ProtoToMarkdownConverter()
-        self.converter.proto_dirs = [self.proto_dir]
 
-    def tearDown(self):
+class _ProtoTreeFixture:
+    """Mixin writing the user and document proto tree shared by the test classes below"""
+
+    @classmethod
+    def _build_proto_tree(cls, proto_dir, user_proto, data_proto, service_proto):
+        """Write the proto files under proto_dir, returning their paths"""
+        cls.example_dir = os.path.join(proto_dir, "example", "document", "v1")
+        cls.user_proto_path = os.path.join(proto_dir, "user.proto")
+        cls.data_proto_path = os.path.join(cls.example_dir, "data.proto")
+        cls.service_proto_path = os.path.join(cls.example_dir, "service.proto")
+        cls.proto_files = [
+            cls.user_proto_path,
+            cls.data_proto_path,
+            cls.service_proto_path,
+        ]
+
+        for path, body in zip(cls.proto_files, (user_proto, data_proto, service_proto)):
+            proto_path = Path(path)
+            proto_path.parent.mkdir(parents=True, exist_ok=True)
+            proto_path.write_bytes(body)
+        return cls.proto_files
+
+    @classmethod
+    def tearDownClass(cls):
         # Remove the temporary directory
-        shutil.rmtree(self.temp_dir)
+        remove_tmpdir(cls.temp_dir)
 
-    def test_convert_proto_files(self):
-        """Test converting proto files to markdown"""
-        proto_files = [
-            self.user_proto_path,
+
+class TestProtoImportResolver(_ProtoTreeFixture, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Create a temporary directory for test proto files
+        cls.temp_dir = tempfile.mkdtemp(dir=fast_tmpdir())
+        proto_files = cls._build_proto_tree(
+            cls.temp_dir,
+            RESOLVER_USER_PROTO,
+            RESOLVER_DATA_PROTO,
+            RESOLVER_SERVICE_PROTO,
+        )
+
+        # Initialize the resolver
+        cls.resolver = ProtoImportResolver([cls.temp_dir])
+        cls.resolver.initialize(proto_files)
+
+    def test_resolve_import(self):
+        """Test that imports are correctly resolved"""
+        # Test resolving user.proto
+        resolved_path = self.resolver.resolve_import("user.proto", self.data_proto_path)
+        self.assertEqual(resolved_path, self.user_proto_path)
+
+        # Test resolving data.proto from service.proto
+        resolved_path = self.resolver.resolve_import(
+            "example/document/v1/data.proto", self.service_proto_path
+        )
+        self.assertEqual(resolved_path, self.data_proto_path)
+
+    def test_package_map(self):
+        """Test that package map is properly populated"""
+        # Test getting user package file
+        self.assertIn("user", self.resolver.package_map)
+        self.assertEqual(self.resolver.package_map["user"], self.user_proto_path)
+
+        # Test getting example.document.v1 package file
+        self.assertIn("example.document.v1", self.resolver.package_map)
+        # The package map only has one entry per package, not multiple files
+        self.assertTrue(
+            self.resolver.package_map["example.document.v1"] == self.data_proto_path
+            or self.resolver.package_map["example.document.v1"]
+            == self.service_proto_path
+        )
+
+    def test_unchanged_files_not_read_again(self):
+        """Test that re-initializing only reads files that changed"""
+        # Use a resolver of its own, the shared one must not see the changed file
+        resolver = ProtoImportResolver([self.temp_dir])
+        resolver.initialize(self.proto_files)
+
+        # Change one file, keeping the others untouched
+        self.addCleanup(Path(self.user_proto_path).write_bytes, RESOLVER_USER_PROTO)
+        with open(self.user_proto_path, "a") as f:
+            f.write("\nmessage Group {\n  string id = 1;\n}\n")
+
+        with mock.patch("builtins.open", wraps=open) as opened:
+            resolver.initialize(self.proto_files)
+
+        self.assertEqual(
+            [call.args[0] for call in opened.call_args_list], [self.user_proto_path]
+        )
+        self.assertEqual(resolver.cross_references["user.Group"], self.user_proto_path)
+        self.assertEqual(
+            resolver.cross_references["example.document.v1.Document"],
             self.data_proto_path,
-            self.service_proto_path,
-        ]
-        generated_files = self.converter.convert_proto_files(
-            proto_files, self.output_dir
         )
 
+
+class TestProtoToMarkdownConverter(_ProtoTreeFixture, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Create a temporary directory for test output
+        cls.temp_dir = tempfile.mkdtemp(dir=fast_tmpdir())
+        cls.output_dir = os.path.join(cls.temp_dir, "output")
+        os.makedirs(cls.output_dir)
+
+        # Create test proto files
+        cls.proto_dir = os.path.join(cls.temp_dir, "proto")
+        proto_files = cls._build_proto_tree(
+            cls.proto_dir,
+            DOCUMENTED_USER_PROTO,
+            DOCUMENTED_DATA_PROTO,
+            DOCUMENTED_SERVICE_PROTO,
+        )
+
+        # Convert the proto files once, the tests only read the generated markdown
+        cls.converter = ProtoToMarkdownConverter()
+        cls.converter.proto_dirs = [cls.proto_dir]
+        cls.generated_files = cls.converter.convert_proto_files(
+            proto_files, cls.output_dir
+        )
+
+    def test_convert_proto_files(self):
+        """Test converting proto files to markdown"""
         # Check that the correct number of files were generated
-        self.assertEqual(len(generated_files), 3)
+        self.assertEqual(len(self.generated_files), 3)
 
         # Check that the files were created with the correct paths
         expected_paths = [
@@ -257,8 +267,7 @@ message GetDocumentRequest {
         data_md_path = os.path.join(
             self.output_dir, "example", "document", "v1", "data.md"
         )
-        with open(data_md_path, "r") as f:
-            content = f.read()
+        content = Path(data_md_path).read_text(encoding="utf-8")
 
         # Check that the Document message is included
         self.assertIn("### Document", content)
@@ -274,8 +283,7 @@ message GetDocumentRequest {
         service_md_path = os.path.join(
             self.output_dir, "example", "document", "v1", "service.md"
         )
-        with open(service_md_path, "r") as f:
-            content = f.read()
+        content = Path(service_md_path).read_text(encoding="utf-8")
 
         # Check that the DocumentService is included
         self.assertIn("### DocumentService", content)
@@ -290,8 +298,7 @@ message GetDocumentRequest {
         data_md_path = os.path.join(
             self.output_dir, "example", "document", "v1", "data.md"
         )
-        with open(data_md_path, "r") as f:
-            content = f.read()
+        content = Path(data_md_path).read_text(encoding="utf-8")
 
         # Check that there's a link to the User message - the exact format may vary
         # based on how the plugin generates links, but should contain both User and a link
@@ -1,52 +1,72 @@
 import unittest
 import tempfile
 import os
-import shutil
-import time
+from pathlib import Path
 
+from watchdog.events import FileModifiedEvent
+
+from mkdocs_protobuf_plugin.file_cache import ProtoFileCache
 from mkdocs_protobuf_plugin.plugin import ProtobufPlugin
+from mkdocs_protobuf_plugin.watcher import ProtoFileEventHandler
+from test import fast_tmpdir, remove_tmpdir
+
+TEST_PROTO = b"""
+syntax = "proto3";
+package test;
+message TestMessage {
+    string name = 1;
+}
+"""
+
+MODIFIED_TEST_PROTO = b"""
+syntax = "proto3";
+package test;
+message TestMessage {
+    string name = 1;
+    string description = 2;  // Added a new field
+}
+"""
 
 
 class TestPluginFileProcessing(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
+    @classmethod
+    def setUpClass(cls):
+        # Create the proto directory once for all tests in this class
+        cls.proto_root = tempfile.mkdtemp(dir=fast_tmpdir())
+        cls.proto_dir = os.path.join(cls.proto_root, "proto")
+        os.makedirs(cls.proto_dir)
+
+        # Create a test proto file
+        cls.test_proto_file = os.path.join(cls.proto_dir, "test.proto")
+        Path(cls.test_proto_file).write_bytes(TEST_PROTO)
+
+    @classmethod
+    def tearDownClass(cls):
+        # Clean up proto directory
+        remove_tmpdir(cls.proto_root)
 
-        # Create proto directory
-        self.proto_dir = os.path.join(self.temp_dir, "proto")
-        os.makedirs(self.proto_dir)
+    def setUp(self):
+        # Create a temporary directory for the generated docs and the cache
+        self.temp_dir = tempfile.mkdtemp(dir=fast_tmpdir())
 
         # Create output directory
         self.output_dir = os.path.join(self.temp_dir, "docs", "api")
         os.makedirs(os.path.join(self.temp_dir, "docs"), exist_ok=True)
 
-        # Create a test proto file
-        self.test_proto_file = os.path.join(self.proto_dir, "test.proto")
-        with open(self.test_proto_file, "w") as f:
-            f.write("""
-syntax = "proto3";
-package test;
-message TestMessage {
-    string name = 1;
-}
-""")
-
-        # Initialize plugin
+        # Initialize plugin, with a cache of its own so every test starts unconverted
         self.plugin = ProtobufPlugin()
+        self.plugin.file_cache = ProtoFileCache(
+            cache_file=os.path.join(self.temp_dir, "cache.json")
+        )
         self.plugin.config = {
             'proto_paths': [self.proto_dir],
             'output_dir': 'api'
         }
 
-        # Create a minimal MkDocs config
-        self.mkdocs_config = {
-            'docs_dir': os.path.join(self.temp_dir, "docs"),
-            'nav': []
-        }
-
     def tearDown(self):
-        # Clean up
-        shutil.rmtree(self.temp_dir)
+        # Restore the proto file for the other tests and clean up
+        Path(self.test_proto_file).write_bytes(TEST_PROTO)
+        remove_tmpdir(self.temp_dir)
 
     def test_initial_file_processing(self):
         """Test that files are processed on first run"""
@@ -64,18 +84,16 @@ message TestMessage {
     def test_unchanged_file_skipping(self):
         """Test that unchanged files are skipped on subsequent runs"""
         # First run - should process the file
+        output_file = os.path.join(self.output_dir, "test.md")
         generated_files1 = self.plugin._process_proto_files(
             [self.proto_dir],
             self.output_dir
         )
-        self.assertEqual(len(generated_files1), 1)
+        self.assertCountEqual(generated_files1, [output_file])
 
-        # Get file modification time
-        output_file = os.path.join(self.output_dir, "test.md")
-        mtime1 = os.path.getmtime(output_file)
-
-        # Wait a moment to ensure any new write would have a different timestamp
-        time.sleep(0.1)
+        # Move the output back in time so any new write would change its timestamp
+        mtime1 = os.path.getmtime(output_file) - 10
+        os.utime(output_file, (mtime1, mtime1))
 
         # Second run - should skip the file since it hasn't changed
         generated_files2 = self.plugin._process_proto_files(
@@ -84,7 +102,7 @@ message TestMessage {
         )
 
         # Should return empty list since no files changed
-        self.assertEqual(len(generated_files2), 0)
+        self.assertCountEqual(generated_files2, [])
 
         # Output file should not have been modified
         mtime2 = os.path.getmtime(output_file)
@@ -98,23 +116,14 @@ message TestMessage {
             self.output_dir
         )
 
-        # Get file modification time
+        # Move the output back in time so the new write changes its timestamp
         output_file = os.path.join(self.output_dir, "test.md")
-        mtime1 = os.path.getmtime(output_file)
+        mtime1 = os.path.getmtime(output_file) - 10
+        os.utime(output_file, (mtime1, mtime1))
 
-        # Wait a moment to ensure any new write would have a different timestamp
-        time.sleep(0.1)
-
-        # Modify the proto file
-        with open(self.test_proto_file, "w") as f:
-            f.write("""
-syntax = "proto3";
-package test;
-message TestMessage {
-    string name = 1;
-    string description = 2;  // Added a new field
-}
-""")
+        # Modify the proto file, moving its timestamp forward
+        Path(self.test_proto_file).write_bytes(MODIFIED_TEST_PROTO)
+        os.utime(self.test_proto_file, (mtime1 + 20, mtime1 + 20))
 
         # Second run - should process the file again
         generated_files2 = self.plugin._process_proto_files(
@@ -123,12 +132,102 @@ message TestMessage {
         )
 
         # Should return the output file since the proto file changed
-        self.assertEqual(len(generated_files2), 1)
+        self.assertCountEqual(generated_files2, [output_file])
 
         # Output file should have been modified
         mtime2 = os.path.getmtime(output_file)
         self.assertNotEqual(mtime1, mtime2)
 
+    def test_unchanged_file_outputs_reused(self):
+        """Test that unchanged files keep their output and missing outputs are regenerated"""
+        output_file = os.path.join(self.output_dir, "test.md")
+        abs_proto_file = os.path.abspath(self.test_proto_file)
+
+        self.plugin._process_proto_files([self.proto_dir], self.output_dir)
+        self.assertEqual(self.plugin.output_files, {abs_proto_file: output_file})
+
+        # The output of an unchanged file is still known to a fresh plugin
+        plugin = ProtobufPlugin()
+        plugin.file_cache = ProtoFileCache(cache_file=self.plugin.file_cache.cache_file)
+        self.assertEqual(plugin._process_proto_files([self.proto_dir], self.output_dir), [])
+        self.assertEqual(plugin.output_files, {abs_proto_file: output_file})
+
+        # A deleted output is regenerated even though the proto file is unchanged
+        os.remove(output_file)
+        generated_files = plugin._process_proto_files([self.proto_dir], self.output_dir)
+        self.assertEqual(generated_files, [output_file])
+        self.assertTrue(os.path.exists(output_file))
+
+
+class TestProtoFileEventHandler(unittest.TestCase):
+    def test_should_ignore(self):
+        """Test that events outside watched paths or inside the output dir are ignored"""
+        root = os.path.abspath("project")
+        proto_dir = os.path.join(root, "proto")
+        single_proto = os.path.join(root, "extra", "single.proto")
+        output_dir = os.path.join(root, "docs", "api")
+        handler = ProtoFileEventHandler(
+            None, [proto_dir, single_proto], [proto_dir], output_dir, {}, None
+        )
+
+        self.assertFalse(handler._should_ignore(os.path.join(proto_dir, "a.proto")))
+        self.assertFalse(handler._should_ignore(os.path.join(proto_dir, "v1", "b.proto")))
+        self.assertFalse(handler._should_ignore(single_proto))
+        self.assertTrue(handler._should_ignore(os.path.join(root, "proto2", "c.proto")))
+        self.assertTrue(handler._should_ignore(os.path.join(root, "extra", "other.proto")))
+        self.assertTrue(handler._should_ignore(os.path.join(output_dir, "d.proto")))
+
+    def test_events_debounced(self):
+        """Test that a burst of events is processed as a single conversion"""
+        temp_dir = tempfile.mkdtemp(dir=fast_tmpdir())
+        self.addCleanup(remove_tmpdir, temp_dir)
+        proto_dir = os.path.join(temp_dir, "proto")
+        output_dir = os.path.join(temp_dir, "docs", "api")
+        os.makedirs(proto_dir)
+        proto_files = []
+        for name in ("a", "b"):
+            proto_file = os.path.join(proto_dir, f"{name}.proto")
+            Path(proto_file).write_bytes(
+                b'syntax = "proto3";\npackage %s;\nmessage M { string id = 1; }\n' % name.encode()
+            )
+            proto_files.append(proto_file)
+
+        plugin = ProtobufPlugin()
+        plugin.file_cache = ProtoFileCache(cache_file=os.path.join(temp_dir, "cache.json"))
+        conversions = []
+        convert_proto_files = plugin.converter.convert_proto_files
+
+        def counting_convert_proto_files(files, out_dir):
+            conversions.append(sorted(files))
+            return convert_proto_files(files, out_dir)
+
+        plugin.converter.convert_proto_files = counting_convert_proto_files
+
+        # A long delay keeps the timer from firing during the test
+        handler = ProtoFileEventHandler(
+            plugin.converter,
+            [proto_dir],
+            [proto_dir],
+            output_dir,
+            {"docs_dir": os.path.join(temp_dir, "docs"), "nav": []},
+            plugin,
+            debounce_delay=60,
+        )
+        self.addCleanup(handler.cancel)
+
+        for proto_file in proto_files + proto_files:
+            handler.on_modified(FileModifiedEvent(proto_file))
+        self.assertEqual(conversions, [])
+
+        handler.flush()
+        self.assertEqual(conversions, [proto_files])
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "a.md")))
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "b.md")))
+
+        # Nothing is left queued after the flush
+        handler.flush()
+        self.assertEqual(len(conversions), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
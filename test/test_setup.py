@@ -3,13 +3,31 @@
 Setup script for testing the MkDocs Protobuf Plugin.
 This script creates sample proto files and sets up a test MkDocs project.
 """
+import argparse
+import hashlib
+import importlib.util
+import json
+import logging
 import os
-import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
 # Removed unused import: shutil, Path
 
-# Sample proto file content
-SAMPLE_USER_PROTO = """
+try:
+    from mkdocs.commands.build import build as mkdocs_build
+    from mkdocs.config import load_config
+    from mkdocs.exceptions import MkDocsException
+except ImportError:
+    # MkDocs cannot be imported here, the site is built with the mkdocs command
+    mkdocs_build = None
+
+    class MkDocsException(Exception):
+        """Stand-in so build errors can be caught without MkDocs installed"""
+
+
+# Sample proto file content, kept as bytes so they are written without encoding
+SAMPLE_USER_PROTO = b"""
 syntax = "proto3";
 
 package user;
@@ -96,7 +114,7 @@ message ListUsersResponse {
 }
 """
 
-SAMPLE_DATA_PROTO = """
+SAMPLE_DATA_PROTO = b"""
 syntax = "proto3";
 
 package example.document.v1;
@@ -205,7 +223,7 @@ message SearchDocumentResponse {
 }
 """
 
-SAMPLE_SERVICE_PROTO = """
+SAMPLE_SERVICE_PROTO = b"""
 syntax = "proto3";
 
 package example.document.v1;
@@ -346,7 +364,7 @@ message ListDocumentsResponse {
 }
 """
 
-SAMPLE_TEST_PROTO = """
+SAMPLE_TEST_PROTO = b"""
 syntax = "proto3";
 
 package test;
@@ -363,43 +381,7 @@ message TestMessage {
 }
 """
 
-
-def setup_test_project(project_dir):
-    """
-    Set up a test project with proto files in the given directory.
-
-    Args:
-        project_dir: The directory to set up the test project in
-    """
-    # Create proto directory
-    proto_dir = os.path.join(project_dir, "proto")
-    os.makedirs(proto_dir, exist_ok=True)
-
-    # Create nested directory structure
-    nested_proto_dir = os.path.join(proto_dir, "example", "document", "v1")
-    os.makedirs(nested_proto_dir, exist_ok=True)
-
-    # Create proto files
-    with open(os.path.join(proto_dir, "user.proto"), "w") as f:
-        f.write(SAMPLE_USER_PROTO)
-
-    with open(os.path.join(proto_dir, "test.proto"), "w") as f:
-        f.write(SAMPLE_TEST_PROTO)
-
-    with open(os.path.join(nested_proto_dir, "data.proto"), "w") as f:
-        f.write(SAMPLE_DATA_PROTO)
-
-    with open(os.path.join(nested_proto_dir, "service.proto"), "w") as f:
-        f.write(SAMPLE_SERVICE_PROTO)
-
-    # Create docs directory
-    docs_dir = os.path.join(project_dir, "docs")
-    os.makedirs(docs_dir, exist_ok=True)
-
-    # Create mkdocs.yml
-    with open(os.path.join(project_dir, "mkdocs.yml"), "w") as f:
-        f.write(
-            """
+SAMPLE_MKDOCS_YML = b"""
 site_name: MkDocs Protobuf Plugin Test
 site_description: Test site for the MkDocs Protobuf Plugin
 
@@ -418,12 +400,8 @@ markdown_extensions:
   - pymdownx.highlight
   - pymdownx.superfences
 """
-        )
 
-    # Create index.md
-    with open(os.path.join(docs_dir, "index.md"), "w") as f:
-        f.write(
-            """
+SAMPLE_INDEX_MD = b"""
 # MkDocs Protobuf Plugin Test
 
 This is a test site for the MkDocs Protobuf Plugin.
@@ -434,28 +412,278 @@ The API documentation is automatically generated from Proto files.
 
 Check out the [API Reference](api/index.md) section.
 """
-        )
+
+
+def _digest(data):
+    """Return the digest used to compare file contents"""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+# Digests of the sample files, computed once when the module is imported
+SAMPLE_DIGESTS = {
+    content: _digest(content)
+    for content in (
+        SAMPLE_USER_PROTO,
+        SAMPLE_DATA_PROTO,
+        SAMPLE_SERVICE_PROTO,
+        SAMPLE_TEST_PROTO,
+        SAMPLE_MKDOCS_YML,
+        SAMPLE_INDEX_MD,
+    )
+}
+
+# Files of a test project, with paths relative to the project directory
+_WRITES = (
+    ("proto/user.proto", SAMPLE_USER_PROTO),
+    ("proto/test.proto", SAMPLE_TEST_PROTO),
+    ("proto/example/document/v1/data.proto", SAMPLE_DATA_PROTO),
+    ("proto/example/document/v1/service.proto", SAMPLE_SERVICE_PROTO),
+    ("mkdocs.yml", SAMPLE_MKDOCS_YML),
+    ("docs/index.md", SAMPLE_INDEX_MD),
+)
+
+# Digests of the project files of the last successful build, next to mkdocs.yml
+MANIFEST_FILE = ".mkdocs-protobuf-setup.hashes"
+
+# Manifest entry holding the digest of the plugin sources the site was built with
+PLUGIN_SOURCES_KEY = "plugin_sources"
+
+
+def write_if_changed(path, content):
+    """
+    Write the content bytes to path, unless the file already holds exactly
+    that content.
+
+    Returns True if the file was written.
+    """
+    digest = SAMPLE_DIGESTS.get(content) or _digest(content)
+    try:
+        # Files of another size cannot hold the same content
+        if os.stat(path).st_size == len(content):
+            with open(path, "rb") as f:
+                if _digest(f.read()) == digest:
+                    return False
+    except FileNotFoundError:
+        pass
+
+    with open(path, "wb") as f:
+        f.write(content)
+    return True
+
+
+def project_files(project_dir):
+    """
+    Return the files of a test project as (path, content) pairs.
+
+    Args:
+        project_dir: The directory of the test project
+    """
+    return [
+        (os.path.join(project_dir, *relpath.split("/")), content)
+        for relpath, content in _WRITES
+    ]
+
+
+def setup_test_project(project_dir):
+    """
+    Set up a test project with proto files in the given directory.
+
+    Args:
+        project_dir: The directory to set up the test project in
+    """
+    files = project_files(project_dir)
+
+    # Create the deepest directories only, their parents are created with them
+    directories = {os.path.dirname(path) for path, _ in files}
+    for directory in directories:
+        if not any(other.startswith(directory + os.sep) for other in directories):
+            os.makedirs(directory, exist_ok=True)
+
+    # Create the proto files, mkdocs.yml and index.md, the writes are independent
+    # of each other so they run concurrently
+    with ThreadPoolExecutor(max_workers=len(files)) as executor:
+        futures = [
+            executor.submit(write_if_changed, path, content) for path, content in files
+        ]
+        for future in futures:
+            # Raise any error from the writes
+            future.result()
 
     print(f"Test project set up in {project_dir}")
     return project_dir
 
 
+def _plugin_dir():
+    """Return the directory of the plugin package used for the build"""
+    spec = importlib.util.find_spec("mkdocs_protobuf_plugin")
+    if spec is not None and spec.submodule_search_locations:
+        return list(spec.submodule_search_locations)[0]
+    # Not importable here, the mkdocs command uses the package of this checkout
+    return os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "mkdocs_protobuf_plugin",
+    )
+
+
+def _plugin_digest():
+    """Return a digest of the plugin sources, so code changes trigger a rebuild"""
+    plugin_dir = _plugin_dir()
+    digest = hashlib.blake2b(digest_size=16)
+    for root, dirs, files in os.walk(plugin_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, plugin_dir).encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                digest.update(_digest(f.read()))
+    return digest.hexdigest()
+
+
+def _expected_manifest():
+    """
+    Return the digests the project files should have, keyed by relative path,
+    along with the digest of the plugin sources.
+    """
+    manifest = {
+        relpath: SAMPLE_DIGESTS[content].hex() for relpath, content in _WRITES
+    }
+    manifest[PLUGIN_SOURCES_KEY] = _plugin_digest()
+    return manifest
+
+
+def is_up_to_date(project_dir):
+    """
+    Check whether the test project was built from the current sample files.
+
+    The project is up to date when the manifest of the last successful build
+    matches the sample files and the current plugin sources, the files on disk
+    still hold the sample contents and the site exists.
+
+    Args:
+        project_dir: The directory of the test project
+    """
+    try:
+        with open(os.path.join(project_dir, MANIFEST_FILE), "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    if manifest != _expected_manifest():
+        return False
+
+    for path, content in project_files(project_dir):
+        try:
+            with open(path, "rb") as f:
+                if _digest(f.read()) != SAMPLE_DIGESTS[content]:
+                    return False
+        except OSError:
+            return False
+
+    return os.path.isdir(os.path.join(project_dir, "site"))
+
+
+def save_manifest(project_dir):
+    """
+    Record the digests of the project files and the plugin sources after a
+    successful build.
+
+    Args:
+        project_dir: The directory of the test project
+    """
+    with open(os.path.join(project_dir, MANIFEST_FILE), "w") as f:
+        json.dump(_expected_manifest(), f, indent=2, sort_keys=True)
+
+
+def build_site(project_dir, quiet=False):
+    """
+    Build the MkDocs site of a test project.
+
+    The build runs in this process when MkDocs can be imported, and falls back
+    to the mkdocs command otherwise.
+
+    Args:
+        project_dir: The directory of the test project
+        quiet: Whether to hide the build output, errors are still reported
+    """
+    if mkdocs_build is None:
+        # The output of the command goes straight to the console, it is never
+        # collected in a pipe
+        command = ["mkdocs", "build", "--quiet"] if quiet else ["mkdocs", "build"]
+        subprocess.run(command, cwd=project_dir, check=True)
+        return
+
+    # The plugin resolves proto_paths against the working directory, like the
+    # mkdocs command run from the project directory
+    cwd = os.getcwd()
+    os.chdir(project_dir)
+    mkdocs_log = logging.getLogger("mkdocs")
+    log_level = mkdocs_log.level
+    handler = None
+    if quiet:
+        mkdocs_log.setLevel(logging.ERROR)
+    else:
+        # Show the build messages like the mkdocs command does, without a
+        # handler only warnings and errors would reach the console
+        mkdocs_log.setLevel(logging.INFO)
+        if not mkdocs_log.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(levelname)-8s-  %(message)s"))
+            mkdocs_log.addHandler(handler)
+    try:
+        config = load_config(config_file="mkdocs.yml")
+        config.plugins.on_startup(command="build", dirty=False)
+        try:
+            mkdocs_build(config)
+        finally:
+            config.plugins.on_shutdown()
+    finally:
+        if handler is not None:
+            mkdocs_log.removeHandler(handler)
+        mkdocs_log.setLevel(log_level)
+        os.chdir(cwd)
+
+
 def main():
     """
     Main function to set up a test project.
     """
-    if len(sys.argv) < 2:
-        project_dir = os.path.join(os.getcwd(), "test-project")
-    else:
-        project_dir = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        description="Set up and build a test project for the MkDocs Protobuf Plugin"
+    )
+    parser.add_argument(
+        "project_dir",
+        nargs="?",
+        default=os.path.join(os.getcwd(), "test-project"),
+        help="directory to set up the test project in",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="build the site even if the project is up to date",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="hide the MkDocs build output except for errors",
+    )
+    args = parser.parse_args()
+    project_dir = args.project_dir
+
+    # Nothing to do when the last build used the same files
+    if not args.force and is_up_to_date(project_dir):
+        print(f"Test project in {project_dir} is up to date, skipping the build")
+        return
 
     setup_test_project(project_dir)
 
     # Run mkdocs build
     try:
-        subprocess.run(["mkdocs", "build"], cwd=project_dir, check=True)
+        build_site(project_dir, quiet=args.quiet)
+        save_manifest(project_dir)
         print("MkDocs build successful!")
-    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+    except (subprocess.CalledProcessError, FileNotFoundError, MkDocsException) as e:
         print(f"Error building MkDocs site: {e}")
 
 